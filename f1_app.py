@@ -0,0 +1,33 @@
+"""All dashboards as one multipage Streamlit app:
+
+    streamlit run f1_app.py
+
+Every page runs in the same server process and imports the same modules, so
+the lap models, fitted predictions, decoded track images and rendered-chart
+caches are loaded once per process instead of once per separately launched
+dashboard. The page scripts still run on their own with ``streamlit run``.
+"""
+import streamlit as st
+
+from f1_imports import CHART_IMPORTS, PDF_IMPORTS, warm_imports
+
+st.set_page_config(page_title="Math Behind F1 Racing", page_icon="🏎️", layout="wide")
+
+PAGES = {
+    "Lap Calculator": [
+        st.Page("f1_dashboard.py", title="Fastest Lap Calculator", icon="🏁", default=True),
+        st.Page("f1_racing_dashboard2.py", title="Racing Dashboard", icon="📊"),
+        st.Page("f1_racing_dashboard1.py", title="Track Explorer", icon="🗺️"),
+        st.Page("f1_racing_dashboard.py", title="Quick Lap Calculator", icon="⏱️"),
+    ],
+    "Lap Time Model": [
+        st.Page("f1_lap_time_dashboard3.py", title="Lap Time Model", icon="📐"),
+        st.Page("f1_lap_time_dashboard4.py", title="Lap Time Model (Dark)", icon="🌙"),
+        st.Page("f1_lap_time_dashboard1.py", title="Lap Time Model (Basic)", icon="📈"),
+    ],
+}
+
+st.navigation(PAGES).run()
+
+# The first page is painted; load what the other pages need in the background
+warm_imports(*PDF_IMPORTS, *CHART_IMPORTS)
@@ -0,0 +1,100 @@
+import io
+import os
+import threading
+from functools import lru_cache
+
+from f1_storage import cache_path
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+# Served by Streamlit at app/static/ (server.enableStaticServing in .streamlit/config.toml)
+STATIC_DIR = os.path.join(ASSET_DIR, "static")
+
+# Display widths actually used by the dashboards (px); sources are never upscaled
+TRACK_IMAGE_WIDTH = 1200  # track layouts in the wide-layout main column
+BACKGROUND_WIDTH = 1280  # full-page background, dimmed behind the dark containers
+
+# Variants built at startup: (source file, width, format)
+ASSET_VARIANTS = [
+    ("monza.png", TRACK_IMAGE_WIDTH, "webp"),
+    ("Silverstone.png", TRACK_IMAGE_WIDTH, "webp"),
+    ("Spa.png", TRACK_IMAGE_WIDTH, "webp"),
+    ("Suzuka.png", TRACK_IMAGE_WIDTH, "webp"),
+    ("f1_image3.jpg", BACKGROUND_WIDTH, "jpeg"),
+]
+QUALITY = {"webp": 80, "jpeg": 70}
+
+
+# --- Decode & Resize ---
+@lru_cache(maxsize=None)
+def _decoded(name):
+    from PIL import Image  # only needed when a variant is not on disk yet
+
+    with Image.open(os.path.join(ASSET_DIR, name)) as image:
+        image.load()
+        return image
+
+
+def _encode(name, width, fmt):
+    from PIL import Image
+
+    image = _decoded(name)
+    if image.width > width:
+        image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+    if fmt == "jpeg" and image.mode != "RGB":
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt.upper(), quality=QUALITY.get(fmt, 85), optimize=True)
+    return buffer.getvalue()
+
+
+# --- Shared Cache ---
+@lru_cache(maxsize=64)
+def asset_bytes(name, width, fmt="webp"):
+    """Resized, recompressed image bytes, built once per process and kept on disk across restarts."""
+    source = os.path.join(ASSET_DIR, name)
+    stem = os.path.splitext(name)[0]
+    path = cache_path("assets", f"{stem}-{width}.{fmt}")
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(source):
+        with open(path, "rb") as f:
+            return f.read()
+
+    data = _encode(name, width, fmt)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return data
+
+
+@lru_cache(maxsize=None)
+def asset_url(name, width, fmt="jpeg"):
+    """URL of the resized image in Streamlit's static folder, for CSS backgrounds.
+
+    The browser fetches and caches the file once, instead of the page
+    re-sending it inlined on every rerun.
+    """
+    filename = f"{os.path.splitext(name)[0]}-{width}.{fmt}"
+    path = os.path.join(STATIC_DIR, filename)
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(os.path.join(ASSET_DIR, name)):
+        data = asset_bytes(name, width, fmt)
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return f"app/static/{filename}"
+
+
+def track_image(name):
+    return asset_bytes(name, TRACK_IMAGE_WIDTH, "webp")
+
+
+def _warm():
+    for name, width, fmt in ASSET_VARIANTS:
+        asset_bytes(name, width, fmt)
+    _decoded.cache_clear()  # the small variants are cached now; drop the full-resolution pixels
+
+
+# Build every variant in the background as soon as the first page imports this module
+_warmer = threading.Thread(target=_warm, name="f1-asset-warmer", daemon=True)
+_warmer.start()
@@ -0,0 +1,248 @@
+"""Benchmarks for every computational path behind the dashboards.
+
+    python f1_benchmark.py                      # run and print timings
+    python f1_benchmark.py --save-baseline      # store results as the baseline
+    python f1_benchmark.py --compare            # fail if slower/bigger than the baseline
+
+Each path is timed over many calls (garbage collector off, like timeit) and
+reported as a distribution; peak memory is the tracemalloc peak of one call.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from f1_lap_model import calculate_fastest_lap, lap_phases
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+
+# --- Benchmarked Paths ---
+# Each factory does its one-time setup and returns the callable that is timed
+def _fastest_lap():
+    return lambda: calculate_fastest_lap(5.0, 200)
+
+
+def _trapezoid_single():
+    return lambda: lap_phases(5000, 250, 4.0, 6.0)
+
+
+def _trapezoid_batch():
+    rng = np.random.default_rng(0)
+    setups = (rng.uniform(3000, 7000, 100_000), rng.uniform(150, 350, 100_000),
+              rng.uniform(2, 6, 100_000), rng.uniform(4, 8, 100_000))
+    return lambda: lap_phases(*setups)
+
+
+def _regression_fit_predict():
+    from sklearn.linear_model import LinearRegression
+    from f1_prediction import SAMPLE_DATA
+
+    points = np.asarray(SAMPLE_DATA["Monza"], dtype=float)
+
+    def fit_predict():
+        model = LinearRegression()
+        model.fit(points[:, :1], points[:, 1])
+        return model.predict([[200]])[0]
+    return fit_predict
+
+
+def _regression_cached_predict():
+    from f1_prediction import predict_lap_time
+
+    return lambda: predict_lap_time("Monza", 200)
+
+
+def _summary_pdf():
+    from f1_summary_pdf import generate_lap_summary_pdf
+
+    return lambda: generate_lap_summary_pdf.__wrapped__("Monza", 200, 0.03)  # bypass the result cache
+
+
+def _lap_charts():
+    from f1_charts import render_lap_charts
+
+    return lambda: render_lap_charts.__wrapped__(5000, 250, 4.0, 6.0)  # bypass the result cache
+
+
+def _race_sim():
+    from f1_race_sim import simulate_races
+
+    return lambda: simulate_races(1.4, n_races=100_000, seed=0)
+
+
+def _strategy():
+    from f1_strategy import optimize_strategy
+
+    return lambda: optimize_strategy(1.4, 70, 0.3)
+
+
+def _grid_race():
+    from f1_grid_race import default_grid, simulate_grid
+
+    cars = default_grid(200, 5793, 53)
+    return lambda: simulate_grid(cars, 5793, 53, lap_sd=0.005, seed=0)
+
+
+def _vehicle_model():
+    from f1_vehicle_model import simulate_laps
+
+    rng = np.random.default_rng(0)
+    setups = {
+        "max_speed_kmh": rng.uniform(200, 340, 10_000),
+        "mass": rng.uniform(750, 850, 10_000),
+        "power": rng.uniform(500e3, 800e3, 10_000),
+        "drag_area": rng.uniform(0.7, 1.3, 10_000),
+        "downforce_area": rng.uniform(1.5, 4.5, 10_000),
+    }
+    return lambda: simulate_laps(5000, **setups)
+
+
+def _script_run(script):
+    def factory():
+        from streamlit.testing.v1 import AppTest
+
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), script)
+
+        def run():
+            app = AppTest.from_file(path, default_timeout=60).run()
+            app.button[0].click().run()  # "Calculate Fastest Lap" fills the result sections
+            if app.exception:
+                raise RuntimeError(f"{script} raised: {app.exception[0].message}")
+        return run
+    return factory
+
+
+BENCHMARKS = {
+    "calculate_fastest_lap": (_fastest_lap, 20_000),
+    "trapezoid_single": (_trapezoid_single, 5_000),
+    "trapezoid_batch_100k": (_trapezoid_batch, 30),
+    "regression_fit_predict": (_regression_fit_predict, 300),
+    "regression_cached_predict": (_regression_cached_predict, 1_000),
+    "summary_pdf": (_summary_pdf, 200),
+    "lap_charts_render": (_lap_charts, 10),
+    "race_monte_carlo_100k": (_race_sim, 20),
+    "pit_strategy_70_laps": (_strategy, 20),
+    "grid_race_20_cars": (_grid_race, 2_000),
+    "vehicle_model_10k": (_vehicle_model, 5),
+    "script_f1_dashboard": (_script_run("f1_dashboard.py"), 5),
+    "script_f1_racing_dashboard2": (_script_run("f1_racing_dashboard2.py"), 5),
+}
+
+
+# --- Measurement ---
+def measure(func, repeat, warmup=3):
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings_us = np.array(timings) * 1e6
+    return {
+        "repeat": repeat,
+        "min_us": float(timings_us.min()),
+        "median_us": float(np.median(timings_us)),
+        "p95_us": float(np.percentile(timings_us, 95)),
+        "mean_us": float(timings_us.mean()),
+        "stdev_us": float(statistics.stdev(timings_us)) if repeat > 1 else 0.0,
+        "peak_kib": peak / 1024,
+    }
+
+
+def run_benchmarks(names, scale=1.0):
+    results = {}
+    for name in names:
+        factory, repeat = BENCHMARKS[name]
+        results[name] = measure(factory(), max(1, int(repeat * scale)))
+        print(_format_row(name, results[name]), file=sys.stderr)
+    return results
+
+
+# Growth below these absolute amounts is noise, whatever the relative change
+MIN_REGRESSION = {"median_us": 1.0, "peak_kib": 16.0}
+
+
+def compare(results, baseline, tolerance):
+    """One line per path whose median time or peak memory grew beyond the tolerance."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            continue
+        for metric, slack in MIN_REGRESSION.items():
+            if result[metric] > max(reference[metric] * (1 + tolerance), reference[metric] + slack):
+                regressions.append(f"{name}: {metric} {reference[metric]:.1f} -> {result[metric]:.1f}")
+    return regressions
+
+
+def _format_row(name, result):
+    return (f"{name:<28} median {result['median_us']:>12.1f} us  p95 {result['p95_us']:>12.1f} us  "
+            f"min {result['min_us']:>12.1f} us  peak {result['peak_kib']:>10.1f} KiB  (n={result['repeat']})")
+
+
+# --- Command Line ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the lap-time, prediction, PDF and chart paths.")
+    parser.add_argument("paths", nargs="*", metavar="PATH",
+                        help=f"paths to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every repeat count (e.g. 0.1 for a smoke run)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="exit 1 if any path regressed against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative growth (default: 0.25)")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+    unknown = set(args.paths) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown paths: {', '.join(sorted(unknown))}")
+    if args.compare and not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error(f"no baseline at {args.baseline}; run with --save-baseline first")
+
+    results = run_benchmarks(args.paths or list(BENCHMARKS), args.scale)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+import io
+import shutil
+import subprocess
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from f1_lap_model import lap_phases, motion_profile, profile_points
+from f1_lap_surface import ACCELERATIONS, SPEEDS_KMH, sensitivity_slice
+from f1_result_cache import persistent_cache
+
+# Rendered images are cached in memory and on disk (f1_result_cache), so every session and restart shares them.
+# matplotlib and Pillow are imported on the first cache miss, not when a page imports this module.
+# Figures are built outside pyplot, so nothing keeps them alive after rendering;
+# the semaphore bounds how many exist at once across all sessions
+MAX_LIVE_FIGURES = 4
+_figure_slots = threading.BoundedSemaphore(MAX_LIVE_FIGURES)
+
+# Look of the light (f1_lap_time_dashboard1/3) and dark (f1_lap_time_dashboard4) pages
+CHART_STYLES = {
+    "light": {
+        "speed_color": "red",
+        "distance_color": "blue",
+        "text_color": None,
+        "face_color": None,
+        "grid": {},
+        "patch_alpha": None,
+        "cmap": "viridis",
+        "marker_color": "red",
+        "figure_color": "white",
+    },
+    "dark": {
+        "speed_color": "#FF5757",
+        "distance_color": "#FFF700",
+        "text_color": "white",
+        "face_color": "black",
+        "grid": {"linestyle": "--", "alpha": 0.5},
+        "patch_alpha": 0.85,
+        "cmap": "inferno",
+        "marker_color": "#FFF700",
+        "figure_color": "#121212",
+    },
+}
+
+
+def render_figure(draw, fmt="png"):
+    """Create a figure, let ``draw(fig)`` fill it, and return the encoded image bytes."""
+    from matplotlib.figure import Figure
+
+    with _figure_slots:
+        fig = Figure()
+        try:
+            draw(fig)
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format=fmt, dpi=200, bbox_inches="tight")
+            return buffer.getvalue()
+        finally:
+            fig.clear()
+
+
+def _style_axes(fig, ax, style, title, xlabel, ylabel):
+    text = {"color": style["text_color"]} if style["text_color"] else {}
+    ax.set_title(title, **text)
+    ax.set_xlabel(xlabel, **text)
+    ax.set_ylabel(ylabel, **text)
+    if style["text_color"]:
+        ax.tick_params(colors=style["text_color"])
+    if style["face_color"]:
+        ax.set_facecolor(style["face_color"])
+    if style["patch_alpha"] is not None:
+        fig.patch.set_alpha(style["patch_alpha"])
+
+
+def _line_chart(time_points, values, label, color, title, ylabel, style):
+    def draw(fig):
+        ax = fig.subplots()
+        ax.plot(time_points, values, label=label, color=color, marker='o')
+        ax.grid(True, **style["grid"])
+        ax.legend()
+        _style_axes(fig, ax, style, title, 'Time (seconds)', ylabel)
+    return draw
+
+
+# --- Cached Lap Charts ---
+@persistent_cache(maxsize=128)
+def render_lap_charts(track_length, avg_speed_kmh, acceleration, braking, style="light", fmt="png"):
+    """Speed vs. Time and Distance vs. Time images for one lap, cached by the slider inputs."""
+    chart_style = CHART_STYLES[style]
+    phases = lap_phases(track_length, avg_speed_kmh, acceleration, braking)
+    time_points, speed_points, distance_points = profile_points(phases)
+
+    speed_chart = render_figure(_line_chart(time_points, speed_points, 'Speed (m/s)', chart_style["speed_color"],
+                                            'Speed vs. Time', 'Speed (m/s)', chart_style), fmt)
+    distance_chart = render_figure(_line_chart(time_points, distance_points, 'Distance (m)',
+                                               chart_style["distance_color"], 'Distance vs. Time', 'Distance (m)',
+                                               chart_style), fmt)
+    return speed_chart, distance_chart
+
+
+@persistent_cache(maxsize=64)
+def render_sensitivity_heatmap(track_length, braking, avg_speed_kmh, acceleration, style="light", fmt="png"):
+    """Speed x acceleration lap-time heatmap from the precomputed table, with the current setup marked."""
+    chart_style = CHART_STYLES[style]
+
+    def draw(fig):
+        ax = fig.subplots()
+        heatmap = ax.imshow(sensitivity_slice(track_length, braking), origin='lower', aspect='auto',
+                            cmap=chart_style["cmap"],
+                            extent=[ACCELERATIONS[0], ACCELERATIONS[-1], SPEEDS_KMH[0], SPEEDS_KMH[-1]])
+        ax.plot(acceleration, avg_speed_kmh, color=chart_style["marker_color"], marker='o')
+        fig.colorbar(heatmap, ax=ax)
+        _style_axes(fig, ax, chart_style, 'Lap Time Sensitivity (seconds)', 'Acceleration (m/s²)',
+                    'Average Speed (km/h)')
+
+    return render_figure(draw, fmt)
+
+
+# --- Recorded Telemetry ---
+def render_telemetry_charts(session, laps, window=None, style="light", fmt="png"):
+    """Speed vs. Time and Distance vs. Time for stored telemetry laps, one trace per lap.
+
+    ``window`` is an optional (start, end) in seconds from the start of the lap;
+    each trace is drawn with at most MAX_POINTS points, picked from its zoom levels.
+    """
+    from f1_telemetry import session_version
+
+    # The version is part of the cache key, so re-ingesting a session redraws its charts
+    return _render_telemetry_charts(session, tuple(laps), window and tuple(window), session_version(session), style,
+                                    fmt)
+
+
+@lru_cache(maxsize=256)
+def _telemetry_trace(session, lap, column, version):
+    from f1_downsample import build_levels
+    from f1_telemetry import load_laps
+
+    # Only the plotted columns of one lap are read from the store; the zoom levels are built once per trace
+    trace = load_laps(session, [lap], ("time", column))
+    time = np.asarray(trace["time"] - trace["time"][0])
+    values = np.asarray(trace[column] - trace[column][0] if column == "distance" else trace[column])
+    return time, values, build_levels(values)
+
+
+@persistent_cache(maxsize=32)
+def _render_telemetry_charts(session, laps, window, version, style, fmt):
+    from f1_downsample import window_indices
+
+    chart_style = CHART_STYLES[style]
+
+    def chart(column, title, ylabel):
+        def draw(fig):
+            ax = fig.subplots()
+            for lap in laps:
+                time, values, levels = _telemetry_trace(session, lap, column, version)
+                shown = window_indices(levels, time, values, *(window or (None, None)))
+                ax.plot(time[shown], values[shown], label=f"Lap {lap}", linewidth=0.8)
+            ax.grid(True, **chart_style["grid"])
+            ax.legend()
+            _style_axes(fig, ax, chart_style, title, 'Time (seconds)', ylabel)
+        return draw
+
+    return (render_figure(chart("speed", 'Speed vs. Time', 'Speed (m/s)'), fmt),
+            render_figure(chart("distance", 'Distance vs. Time', 'Distance (m)'), fmt))
+
+
+# --- Cached Lap Animations ---
+ANIMATION_FORMATS = {"gif": "image/gif", "apng": "image/png", "webp": "image/webp", "mp4": "video/mp4"}
+
+
+def _encode_frames(frames, fmt, fps):
+    if fmt == "mp4":
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("MP4 output needs ffmpeg on the PATH; use gif, apng or webp instead.")
+        height, width = frames[0].shape[:2]
+        command = ["ffmpeg", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}",
+                   "-r", str(fps), "-i", "-", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p",
+                   "-vcodec", "libx264", "-movflags", "frag_keyframe+empty_moov", "-f", "mp4", "-"]
+        return subprocess.run(command, input=b"".join(f.tobytes() for f in frames), capture_output=True,
+                              check=True).stdout
+
+    from PIL import Image
+
+    images = [Image.fromarray(frame) for frame in frames]
+    buffer = io.BytesIO()
+    images[0].save(buffer, format={"gif": "GIF", "apng": "PNG", "webp": "WEBP"}[fmt], save_all=True,
+                   append_images=images[1:], duration=int(1000 / fps), loop=0)
+    return buffer.getvalue()
+
+
+@persistent_cache(maxsize=32)
+def render_lap_animation(track_length, avg_speed_kmh, acceleration, braking, kind="speed", style="light",
+                         fmt="gif", frames=60, fps=20):
+    """Animated Speed vs. Time or Distance vs. Time over a finely sampled lap, encoded once per input.
+
+    Axes, grid and labels are drawn once; each frame restores that background and
+    redraws only the moving trace (blitting), then Pillow or ffmpeg encodes the frames.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    chart_style = CHART_STYLES[style]
+    phases = lap_phases(track_length, avg_speed_kmh, acceleration, braking)
+    time, speed, distance = motion_profile(phases, n_samples=frames * 10)
+    if kind == "speed":
+        values, color, title, label = speed, chart_style["speed_color"], 'Speed vs. Time', 'Speed (m/s)'
+    else:
+        values, color, title, label = distance, chart_style["distance_color"], 'Distance vs. Time', 'Distance (m)'
+
+    with _figure_slots:
+        fig = Figure(dpi=100)
+        try:
+            canvas = FigureCanvasAgg(fig)
+            ax = fig.subplots()
+            ax.set_xlim(0, time[-1] * 1.02)
+            ax.set_ylim(0, values.max() * 1.2)  # headroom for the legend
+            ax.grid(True, **chart_style["grid"])
+            _style_axes(fig, ax, chart_style, title, 'Time (seconds)', label)
+            # GIF and video frames have no partial transparency, so paint the page color in
+            fig.patch.set_facecolor(chart_style["figure_color"])
+            fig.patch.set_alpha(1)
+            line, = ax.plot([], [], color=color, label=label, animated=True)
+            point, = ax.plot([], [], color=color, marker='o', animated=True)
+            ax.legend(handles=[line], loc='upper left')
+
+            canvas.draw()
+            background = canvas.copy_from_bbox(fig.bbox)
+            encoded_frames = []
+            for end in np.linspace(1, len(time), frames).astype(int):
+                canvas.restore_region(background)
+                line.set_data(time[:end], values[:end])
+                point.set_data(time[end - 1:end], values[end - 1:end])
+                ax.draw_artist(line)
+                ax.draw_artist(point)
+                encoded_frames.append(np.asarray(canvas.buffer_rgba())[..., :3].copy())
+        finally:
+            fig.clear()
+
+    return _encode_frames(encoded_frames, fmt, fps)
@@ -1,170 +1,326 @@
+import numpy as np
 import streamlit as st
-from PIL import Image
-from fpdf import FPDF
-from sklearn.linear_model import LinearRegression
-import pandas as pd
-
-# --- Function to Calculate Lap Time ---
-def calculate_fastest_lap(distance, speed):
-    if speed == 0:
-        return "Invalid speed!"
-    lap_time = distance / speed  # Time = Distance / Speed
-    return round(lap_time, 2)  # Rounded to 2 decimal places
-
-# --- Function to Generate PDF Summary ---
-def generate_lap_summary_pdf(track_name, speed, lap_time):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-
-    pdf.cell(200, 10, txt="F1 Fastest Lap Summary", ln=True, align='C')
-    pdf.ln(10)
-    pdf.cell(200, 10, txt=f"Track Selected: {track_name}", ln=True)
-    pdf.cell(200, 10, txt=f"Speed Entered: {speed} km/h", ln=True)
-    pdf.cell(200, 10, txt=f"Calculated Lap Time: {lap_time} minutes", ln=True)
-
-    output_path = "lap_summary.pdf"
-    pdf.output(output_path)
-    return output_path
-# Save PDF to Bytes (not to disk)
-    import io
-    pdf_output = io.BytesIO()
-    pdf.output(pdf_output)
-    pdf_output.seek(0)
-    return pdf_output
-
-# --- Track Layouts (Ensure images are present in your folder) ---
-track_layouts = {
-    "Monza": "monza.png",
-    "Silverstone": "Silverstone.png",
-    "Spa": "Spa.png",
-    "Suzuka": "Suzuka.png"
-}
+from f1_assets import track_image
+from f1_grid_race import GRID_SIZE, default_grid, simulate_grid
+from f1_imports import PDF_IMPORTS, warm_imports
+from f1_incremental_model import latest_version, model_info
+from f1_lap_model import calculate_fastest_lap
+from f1_lap_records import best_laps, lap_percentiles, record_facets, record_lap_time, records_version
+from f1_metrics import page_timer
+from f1_prediction import predict_lap_time
+from f1_race_sim import DEFAULT_LAPS, DEFAULT_LAP_SD, DEFAULT_PIT_SD, simulate_races
+from f1_sections import SectionGraph, fragment
+from f1_strategy import COMPOUNDS, DEFAULT_TOP_K, optimize_strategy
+from f1_summary_pdf import generate_lap_summary_pdf
+from f1_track_model import speed_profile, track_length
+from f1_ui import TRACK_LAYOUTS, apply_dark_theme
 
 # --- Streamlit UI Setup ---
 st.set_page_config(page_title="F1 Fastest Lap Calculator", layout="wide")
+sections = page_timer("f1_dashboard")  # per-section rerun timings when F1_METRICS=1
+
+# --- Section Dependency Graph ---
+# Each computation names its inputs; results live in session state and are only
+# recomputed when an input changed, so e.g. pit-stop edits never refit or re-look-up anything
+graph = SectionGraph(st.session_state)
+
+@graph.section("lap_inputs")
+def lap_result(lap_inputs):
+    # Only set while the inputs still match the ones "Calculate Fastest Lap" was pressed with
+    return calculate_fastest_lap(*lap_inputs) if lap_inputs else None
+
+
+@graph.section("selected_track", "record_filter", "records_version")
+def real_time(selected_track, record_filter, records_version):
+    season, session = record_filter
+    return record_lap_time(selected_track, season=season, session=session)
+
+
+@graph.section("selected_track", "speed", "model_version")
+def predicted_time(selected_track, speed, model_version):
+    return predict_lap_time(selected_track, speed)
+
+
+@graph.section("selected_track", "speed")
+def circuit_lap_time(selected_track, speed):
+    return speed_profile(selected_track, top_speed_kmh=speed)["lap_time"]
+
+
+@graph.section("selected_track", "speed", "lap_result")
+def pdf_data(selected_track, speed, lap_result):
+    return generate_lap_summary_pdf(selected_track, speed, lap_result)
+
+
+@graph.section("race_setup")
+def race_distribution(race_setup):
+    lap_time, n_laps, lap_sd, pit_stops, pit_duration, pit_sd, safety_car_probability, n_races = race_setup
+    return simulate_races(lap_time, n_laps, lap_sd, pit_stops, pit_duration, pit_sd, safety_car_probability, n_races)
+
+
+@graph.section("strategy_setup")
+def pit_strategies(strategy_setup):
+    lap_time, n_laps, pit_duration, compounds, top_k = strategy_setup
+    return optimize_strategy(lap_time, n_laps, pit_duration, {name: COMPOUNDS[name] for name in compounds}, top_k)
+
+
+@graph.section("grid_defaults")
+def grid_field(grid_defaults):
+    avg_speed_kmh, length, n_laps, pit_duration = grid_defaults
+    return default_grid(avg_speed_kmh, length, n_laps, pit_duration)
+
+
+@graph.section("grid_setup")
+def grid_race(grid_setup):
+    cars, length, n_laps, pit_duration = grid_setup
+    return simulate_grid(cars, length, n_laps, pit_duration)
+
+
+def has_result():
+    result = graph.get("lap_result")
+    return isinstance(result, (int, float))
+
 
 # --- Custom CSS Styling ---
-st.markdown("""
-    <style>
-        body {
-            background-color: #121212;
-            color: white;
-            font-family: Arial, sans-serif;
-        }
-        .stButton > button {
-            background-color: red;
-            color: white;
-            border-radius: 8px;
-            padding: 10px 20px;
-            font-size: 18px;
-        }
-        .stNumberInput > label {
-            font-size: 16px;
-            font-weight: bold;
-        }
-    </style>
-    """, unsafe_allow_html=True)
-
-# --- Sidebar ---
-st.sidebar.title("🏎️ Select F1 Track")
-selected_track = st.sidebar.radio("Choose a Track:", list(track_layouts.keys()))
-
-# --- Main Title ---
-st.title("🏁 F1 Fastest Lap Calculator")
-
-# --- Display Track Image ---
-st.image(track_layouts[selected_track], caption=f"{selected_track} Track Layout", use_container_width=True)
-
-# --- User Inputs ---
-st.subheader("🔢 Enter Lap Details")
-distance = st.number_input("Enter Track Distance (in km)", min_value=0.1, value=5.0, step=0.1)
-speed = st.number_input("Enter Average Speed (in km/h)", min_value=1, value=200, step=1)
-
-# --- Calculate & Show Lap Time ---
-if st.button("🚀 Calculate Fastest Lap"):
-    result = calculate_fastest_lap(distance, speed)
-    st.success(f"🏁 Fastest Lap Time: {result} minutes")
-
-# --- Real F1 Fastest Laps ---
-st.subheader("📊 Compare with Real F1 Fastest Lap")
-f1_fastest_laps = {
-    "Monza": 1.21,
-    "Silverstone": 1.27,
-    "Spa": 1.46,
-    "Suzuka": 1.30
-}
-if selected_track in f1_fastest_laps and speed > 0:
-    real_time = f1_fastest_laps[selected_track]
-    st.write(f"🏎️ Fastest Real Lap Time at {selected_track}: **{real_time} minutes**")
-
-    if 'result' in locals() and isinstance(result, (int, float)):
-        diff = round(result - real_time, 2)
-        if diff < 0:
-            st.success(f"🔥 Your lap is **{abs(diff)} minutes faster** than the real F1 record!")
-        elif diff == 0:
-            st.info("🎯 Your lap exactly matches the real F1 lap time! Wow!")
-        else:
-            st.warning(f"⏱️ Your lap is **{diff} minutes slower** than the real F1 record.")
+with sections("page_setup"):
+    apply_dark_theme()
+
+# --- Track Selection ---
+with sections("track_selection"):
+    # --- Sidebar ---
+    st.sidebar.title("🏎️ Select F1 Track")
+    selected_track = st.sidebar.radio("Choose a Track:", list(TRACK_LAYOUTS.keys()))
+
+    # --- Main Title ---
+    st.title("🏁 F1 Fastest Lap Calculator")
+
+    # --- Display Track Image ---
+    st.image(track_image(TRACK_LAYOUTS[selected_track]), caption=f"{selected_track} Track Layout", use_container_width=True)
+
+# --- Lap Calculation ---
+with sections("lap_calculation"):
+    # --- User Inputs ---
+    st.subheader("🔢 Enter Lap Details")
+    distance = st.number_input("Enter Track Distance (in km)", min_value=0.1, value=5.0, step=0.1)
+    speed = st.number_input("Enter Average Speed (in km/h)", min_value=1, value=200, step=1)
+
+    # --- Calculate & Show Lap Time ---
+    # The button press is remembered in session state, so the result survives later reruns
+    if st.button("🚀 Calculate Fastest Lap"):
+        st.session_state.lap_inputs = (distance, speed)
+    if st.session_state.get("lap_inputs") != (distance, speed):
+        st.session_state.lap_inputs = None
+
+    graph.set_inputs(selected_track=selected_track, speed=speed, lap_inputs=st.session_state.lap_inputs,
+                     model_version=latest_version())
+    result = graph.get("lap_result")
+    if result is not None:
+        st.success(f"🏁 Fastest Lap Time: {result} minutes")
+
+# --- Compare with Real F1 Fastest Lap ---
+with sections("record_comparison"):
+    st.subheader("📊 Compare with Real F1 Fastest Lap")
+    # Season / session filters only appear once a record dump was loaded (python f1_lap_records.py load ...)
+    facets = record_facets(selected_track)
+    season = session = None
+    if facets["season"] or facets["session"]:
+        season_col, session_col = st.columns(2)
+        season = season_col.selectbox("Season", [None, *facets["season"]], format_func=lambda s: str(s or "All seasons"))
+        session = session_col.selectbox("Session", [None, *facets["session"]], format_func=lambda s: s or "All sessions")
+    graph.set_inputs(record_filter=(season, session), records_version=records_version())
+    real_time = graph.get("real_time")
+    if real_time is not None and speed > 0:
+        st.write(f"🏎️ Fastest Real Lap Time at {selected_track}: **{real_time} minutes**")
+        stats = lap_percentiles(selected_track, season=season, session=session)
+        if stats["count"] > 1:
+            st.caption(f"{stats['count']:,} recorded laps · median {stats[50] / 60:.2f} min · "
+                       f"5th–95th percentile {stats[5] / 60:.2f}–{stats[95] / 60:.2f} min")
+            st.dataframe([{"Lap (min)": round(lap["lap_time"] / 60, 3), "Driver": lap["driver"],
+                           "Season": lap["season"], "Session": lap["session"]}
+                          for lap in best_laps(selected_track, season=season, session=session, n=5)], hide_index=True)
+
+        if has_result():
+            diff = round(result - real_time, 2)
+            if diff < 0:
+                st.success(f"🔥 Your lap is **{abs(diff)} minutes faster** than the real F1 record!")
+            elif diff == 0:
+                st.info("🎯 Your lap exactly matches the real F1 lap time! Wow!")
+            else:
+                st.warning(f"⏱️ Your lap is **{diff} minutes slower** than the real F1 record.")
 
 # --- AI-Based Lap Time Prediction ---
-st.subheader("🤖 AI-Based Lap Time Prediction")
-sample_data = {
-    "Monza": [(180, 1.5), (200, 1.3), (220, 1.2), (240, 1.1)],
-    "Silverstone": [(180, 1.6), (200, 1.4), (220, 1.3), (240, 1.2)],
-    "Spa": [(180, 1.8), (200, 1.6), (220, 1.5), (240, 1.4)],
-    "Suzuka": [(180, 1.7), (200, 1.5), (220, 1.4), (240, 1.3)],
-}
-data = sample_data[selected_track]
-df = pd.DataFrame(data, columns=["Speed", "LapTime"])
-
-model = LinearRegression()
-model.fit(df[["Speed"]], df["LapTime"])
-predicted_time = model.predict([[speed]])[0]
-st.write(f"🧠 Predicted Lap Time (AI Model): **{round(predicted_time, 2)} minutes**")
-
-if 'result' in locals() and isinstance(result, (int, float)):
-    ai_diff = round(result - predicted_time, 2)
-    if ai_diff < 0:
-        st.success(f"🚀 You're faster than AI's prediction by {abs(ai_diff)} minutes!")
-    elif ai_diff > 0:
-        st.warning(f"📉 You're {ai_diff} minutes slower than AI's prediction.")
-    else:
-        st.info("🤝 Your time matches the AI prediction!")
+with sections("ai_prediction"):
+    st.subheader("🤖 AI-Based Lap Time Prediction")
+    predicted_time = graph.get("predicted_time")
+    st.write(f"🧠 Predicted Lap Time (AI Model): **{round(predicted_time, 2)} minutes**")
+    history = model_info()
+    if history and selected_track in history["tracks"]:
+        st.caption(f"Trained on {history['tracks'][selected_track]['laps']:,} historical laps (model {history['version']})")
 
-# --- Pit Stop Impact Calculator ---
-st.subheader("🔧 Pit Stop Impact Calculator")
-pit_stops = st.number_input("Enter number of pit stops", min_value=0, value=1, step=1)
-pit_duration = st.number_input("Average time per pit stop (in minutes)", min_value=0.0, value=0.3, step=0.1)
-total_pit_time = pit_stops * pit_duration
-adjusted_lap_time = result + total_pit_time if 'result' in locals() and isinstance(result, (int, float)) else None
-
-if adjusted_lap_time:
-    st.write(f"⏱️ Additional Pit Time: **{round(total_pit_time, 2)} minutes**")
-    st.success(f"🛠️ Adjusted Lap Time including pit stops: **{round(adjusted_lap_time, 2)} minutes**")
-
-    if 'predicted_time' in locals():
-        adjusted_vs_ai = round(adjusted_lap_time - predicted_time, 2)
-        if adjusted_vs_ai < 0:
-            st.success(f"✅ Still {abs(adjusted_vs_ai)} min faster than AI even after pit stops!")
-        elif adjusted_vs_ai > 0:
-            st.warning(f"⚠️ Now {adjusted_vs_ai} min slower than AI due to pit stops.")
+    if has_result():
+        ai_diff = round(result - predicted_time, 2)
+        if ai_diff < 0:
+            st.success(f"🚀 You're faster than AI's prediction by {abs(ai_diff)} minutes!")
+        elif ai_diff > 0:
+            st.warning(f"📉 You're {ai_diff} minutes slower than AI's prediction.")
         else:
-            st.info("🤖 Your adjusted lap matches AI prediction!")
+            st.info("🤝 Your time matches the AI prediction!")
+
+# --- Circuit Model Estimate ---
+with sections("circuit_model"):
+    st.subheader("🗺️ Circuit Model Estimate")
+    st.write(f"📐 Lap Time over the {selected_track} corners at {speed} km/h top speed: "
+             f"**{round(graph.get('circuit_lap_time') / 60, 2)} minutes**")
+
+
+# --- Pit Stop Impact Calculator ---
+# A fragment: changing the pit-stop inputs reruns only this function, not the page above it
+@fragment
+def pit_stop_calculator():
+    with sections("pit_stop_calculator"):
+        st.subheader("🔧 Pit Stop Impact Calculator")
+        pit_stops = st.number_input("Enter number of pit stops", min_value=0, value=1, step=1)
+        pit_duration = st.number_input("Average time per pit stop (in minutes)", min_value=0.0, value=0.3, step=0.1)
+        total_pit_time = pit_stops * pit_duration
+        adjusted_lap_time = graph.get("lap_result") + total_pit_time if has_result() else None
+
+        if adjusted_lap_time:
+            st.write(f"⏱️ Additional Pit Time: **{round(total_pit_time, 2)} minutes**")
+            st.success(f"🛠️ Adjusted Lap Time including pit stops: **{round(adjusted_lap_time, 2)} minutes**")
+
+            adjusted_vs_ai = round(adjusted_lap_time - graph.get("predicted_time"), 2)
+            if adjusted_vs_ai < 0:
+                st.success(f"✅ Still {abs(adjusted_vs_ai)} min faster than AI even after pit stops!")
+            elif adjusted_vs_ai > 0:
+                st.warning(f"⚠️ Now {adjusted_vs_ai} min slower than AI due to pit stops.")
+            else:
+                st.info("🤖 Your adjusted lap matches AI prediction!")
+
+        # --- Full-Race Modes ---
+        monte_carlo = st.checkbox("🎲 Simulate the full race (Monte Carlo)")
+        optimize = st.checkbox("🧠 Optimize pit strategy")
+        full_grid = st.checkbox(f"🏎️ Race the full grid ({GRID_SIZE} cars)")
+        if monte_carlo or optimize:
+            bases = {"Circuit Model": graph.get("circuit_lap_time") / 60}
+            if has_result():
+                bases = {"Your Fastest Lap": graph.get("lap_result"), **bases}
+            base = st.radio("Base lap time", list(bases), horizontal=True)
+        if monte_carlo or optimize or full_grid:
+            n_laps = st.number_input("Race laps", min_value=1, value=DEFAULT_LAPS, step=1)
+
+        if monte_carlo:
+            st.markdown("#### 🎲 Race Time Distribution")
+            lap_sd = st.number_input("Lap-to-lap spread (std dev, minutes)", min_value=0.0, value=DEFAULT_LAP_SD,
+                                     step=0.005, format="%.3f")
+            pit_sd = st.number_input("Pit stop spread (std dev, minutes)", min_value=0.0, value=DEFAULT_PIT_SD,
+                                     step=0.01)
+            safety_car = st.slider("Safety car chance per lap (%)", 0.0, 10.0, 2.0, 0.5)
+            n_races = st.select_slider("Races simulated", options=[10_000, 100_000, 250_000, 500_000], value=100_000)
+
+            graph.set_inputs(race_setup=(bases[base], n_laps, lap_sd, pit_stops, pit_duration, pit_sd,
+                                         safety_car / 100, n_races))
+            race = graph.get("race_distribution")
+            p5, p25, p50, p75, p95 = race["percentiles"].values()
+            st.write(f"🏁 Median Race Time: **{p50:.2f} minutes** (mean {race['mean']:.2f}, std {race['std']:.2f})")
+            st.write(f"📈 50% of races finish in **{p25:.2f}–{p75:.2f}** minutes, 90% in **{p5:.2f}–{p95:.2f}**")
+
+            counts, edges = np.histogram(race["finish_times"], bins=50)
+            st.bar_chart({"Race time (min)": np.round((edges[:-1] + edges[1:]) / 2, 2), "Races": counts},
+                         x="Race time (min)", y="Races")
+
+        if optimize:
+            st.markdown("#### 🧠 Best Pit Strategies")
+            compounds = st.multiselect("Tyre compounds", list(COMPOUNDS), default=list(COMPOUNDS))
+            top_k = st.slider("Strategies to show", 1, 10, DEFAULT_TOP_K)
+
+            graph.set_inputs(strategy_setup=(bases[base], n_laps, pit_duration, tuple(compounds), top_k))
+            strategies = graph.get("pit_strategies")
+            if not strategies:
+                st.warning("⚠️ No valid strategy: pick at least two compounds that can cover the race distance.")
+            else:
+                fastest = strategies[0]["time"]
+                st.table([{
+                    "Stops": strategy["stops"],
+                    "Pit Laps": ", ".join(map(str, strategy["pit_laps"])),
+                    "Stints": " → ".join(f"{name} ({laps})" for name, laps in strategy["stints"]),
+                    "Race Time (min)": round(strategy["time"], 2),
+                    "Gap (s)": round((strategy["time"] - fastest) * 60, 1),
+                } for strategy in strategies])
+                if pit_stops != strategies[0]["stops"]:
+                    st.info(f"💡 The fastest plan uses {strategies[0]['stops']} stop(s), you entered {pit_stops}.")
+
+        if full_grid:
+            st.markdown("#### 🏎️ Full-Grid Race")
+            st.caption(f"Each car's trapezoid setup over {selected_track}, with its own pit plan. "
+                       "Edit any cell and the whole race re-runs.")
+            length = track_length(selected_track)
+            graph.set_inputs(grid_defaults=(speed, length, n_laps, pit_duration))
+            field = graph.get("grid_field")
+            edited = st.data_editor({
+                "Driver": field["driver"],
+                "Speed (km/h)": field["avg_speed_kmh"],
+                "Acceleration (m/s²)": field["acceleration"],
+                "Braking (m/s²)": field["braking"],
+                "Pit Laps": [", ".join(map(str, laps)) for laps in field["pit_laps"]],
+                "Tyres": [", ".join(stints) for stints in field["stints"]],
+            }, hide_index=True, use_container_width=True, key=f"grid_editor_{selected_track}")
+
+            try:
+                cars = {
+                    "driver": list(edited["Driver"]),
+                    "avg_speed_kmh": [float(value) for value in edited["Speed (km/h)"]],
+                    "acceleration": [float(value) for value in edited["Acceleration (m/s²)"]],
+                    "braking": [float(value) for value in edited["Braking (m/s²)"]],
+                    "pit_laps": [[int(lap) for lap in str(text or "").replace(",", " ").split()]
+                                 for text in edited["Pit Laps"]],
+                    "stints": [[name.strip().title() for name in str(text or "").split(",") if name.strip()]
+                               for text in edited["Tyres"]],
+                }
+                graph.set_inputs(grid_setup=(cars, length, n_laps, pit_duration))
+                race = graph.get("grid_race")
+            except (TypeError, ValueError) as error:
+                st.error(f"⚠️ Check the grid: {error}")
+            else:
+                drivers = cars["driver"]
+                gaps = race["gap_to_leader"][:, -1] * 60
+                winner = race["classification"][0]
+                st.table([{
+                    "Pos": int(race["finish"][car]),
+                    "Driver": drivers[car],
+                    "Grid": int(race["grid"][car]),
+                    "+/-": f"{int(race['positions_gained'][car]):+d}",
+                    "Stops": int(race["stops"][car]),
+                    "Time / Gap": (f"{race['race_time'][car, -1]:.2f} min" if car == winner else
+                                   "DNF" if np.isnan(gaps[car]) else f"+{gaps[car]:.1f} s"),
+                } for car in race["classification"]])
+
+                laps = np.arange(1, n_laps + 1)
+                gap_tab, position_tab = st.tabs(["Gap to leader (s)", "Positions"])
+                gap_tab.line_chart({"Lap": laps, **{driver: race["gap_to_leader"][car] * 60
+                                                    for car, driver in enumerate(drivers)}}, x="Lap")
+                position_tab.line_chart({"Lap": laps, **{driver: race["positions"][car]
+                                                         for car, driver in enumerate(drivers)}}, x="Lap")
+
+
+# PDF Download Section (also a fragment, so the export button doesn't rerun the page)
+@fragment
+def pdf_export():
+    with sections("pdf_export"):
+        if has_result():
+            st.subheader("📝 Export Lap Summary")
 
-# PDF Download Section
-if 'result' in locals() and isinstance(result, (int, float)):
-    st.subheader("📝 Export Lap Summary")
+            # Generate PDF when user clicks
+            if st.button("📄 Generate PDF Summary"):
+                # Display Download Button
+                st.download_button(
+                    label="⬇️ Download Lap Summary PDF",
+                    data=graph.get("pdf_data"),  # bytes, rebuilt only when track, speed or result change
+                    file_name="lap_summary.pdf",
+                    mime="application/pdf"
+                )
 
-    # Generate PDF when user clicks
-    if st.button("📄 Generate PDF Summary"):
-        pdf_data = generate_lap_summary_pdf(selected_track, speed, result)
 
-        # Display Download Button
-        st.download_button(
-            label="⬇️ Download Lap Summary PDF",
-            data=pdf_data,
-            file_name="lap_summary.pdf",
-            mime="application/pdf"
-        )
+pit_stop_calculator()
+pdf_export()
 
+# Page is painted; load the PDF library in the background so the first export doesn't wait for it
+warm_imports(*PDF_IMPORTS)
@@ -0,0 +1,253 @@
+"""Load test for the Streamlit dashboards: many concurrent sessions against one server process.
+
+    python f1_dashboard_load_test.py --start f1_dashboard.py --sessions 1 4 16 32 --loops 5
+    python f1_dashboard_load_test.py --start f1_racing_dashboard2.py --sessions 8 --loops 10
+    python f1_dashboard_load_test.py --port 8501 --pid 12345 --sessions 16   # a server you started
+
+Each session is a headless client speaking Streamlit's websocket protocol,
+like a browser tab. It loads the page and then repeats a few steps:
+- pick a track
+- change the distance, speed and pit-stop inputs
+- press "Calculate Fastest Lap"
+- where the page has one, generate and download the PDF summary
+
+A rerun's latency runs from sending the widget change to the server's
+script_finished message.
+
+Sessions are added one concurrency level at a time. For each level the
+report shows rerun latency percentiles and reruns per second. With --start
+or --pid it also shows the server's CPU use and resident memory growth.
+Everything runs on localhost.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.Radio_pb2 import Radio
+
+DEFAULT_PORT = 8599
+TRACK_LABEL = "Choose a Track:"
+CALCULATE_LABEL = "🚀 Calculate Fastest Lap"
+PDF_LABEL = "📄 Generate PDF Summary"
+# Number inputs changed on every loop, with the range their random values come from
+INPUT_RANGES = {
+    "Enter Track Distance (in km)": (3.0, 7.0),
+    "Enter Average Speed (in km/h)": (150, 350),
+    "Enter number of pit stops": (0, 3),
+}
+WIDGET_TYPES = ("radio", "number_input", "button", "download_button", "checkbox", "selectbox", "slider")
+# Streamlit >= 1.40 sends radio choices as option strings, older releases as indices
+STRING_OPTIONS = "raw_value" in Radio.DESCRIPTOR.fields_by_name
+
+
+# --- Headless Session ---
+class DashboardSession:
+    """One browser-less tab: keeps its widget values and reruns the page with them."""
+
+    def __init__(self, websocket):
+        self._websocket = websocket
+        self._states = {}  # widget id -> WidgetState sent with every rerun, as a browser does
+        self.widgets = {}  # label -> (element type, element proto) of the last run
+        self.errors = 0
+
+    async def rerun(self, trigger=None):
+        """Rerun the page (pressing the ``trigger`` button, if given); returns the latency in seconds."""
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.query_string = ""
+        client_state.widget_states.widgets.extend(self._states.values())
+        if trigger is not None:
+            pressed = client_state.widget_states.widgets.add()
+            pressed.id = self.widgets[trigger][1].id
+            pressed.trigger_value = True
+
+        start = time.perf_counter()
+        await self._websocket.send(message.SerializeToString())
+        self.widgets = {}
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self._websocket.recv())
+            kind = forward.WhichOneof("type")
+            if kind == "script_finished":
+                return time.perf_counter() - start
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    self.errors += 1
+                elif element_type in WIDGET_TYPES:
+                    widget = getattr(element, element_type)
+                    self.widgets[widget.label] = (element_type, widget)
+
+    def choose(self, label, index):
+        _, radio = self.widgets[label]
+        state = self._state(radio.id)
+        if STRING_OPTIONS:
+            state.string_value = radio.options[index]
+        else:
+            state.int_value = index
+
+    def set_number(self, label, value):
+        self._state(self.widgets[label][1].id).double_value = value
+
+    def _state(self, widget_id):
+        state = self._states.get(widget_id)
+        if state is None:
+            state = self._states[widget_id] = BackMsg().rerun_script.widget_states.widgets.add()
+            state.id = widget_id
+        return state
+
+
+def _download(url):
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return len(response.read())
+
+
+async def run_session(host, port, loops, seed, results):
+    from websockets.asyncio.client import connect
+
+    rng = np.random.default_rng(seed)
+    timings = results.setdefault("latency", [])
+    async with connect(f"ws://{host}:{port}/_stcore/stream", subprotocols=["streamlit"], max_size=None) as websocket:
+        session = DashboardSession(websocket)
+        timings.append(("load", await session.rerun()))
+        for _ in range(loops):
+            if TRACK_LABEL in session.widgets:
+                session.choose(TRACK_LABEL, int(rng.integers(len(session.widgets[TRACK_LABEL][1].options))))
+                timings.append(("track", await session.rerun()))
+
+            changed = False
+            for label, (low, high) in INPUT_RANGES.items():
+                if label in session.widgets:
+                    value = rng.integers(low, high + 1) if isinstance(low, int) else rng.uniform(low, high)
+                    session.set_number(label, round(float(value), 1))
+                    changed = True
+            if changed:
+                timings.append(("inputs", await session.rerun()))
+
+            if CALCULATE_LABEL in session.widgets:
+                timings.append(("calculate", await session.rerun(CALCULATE_LABEL)))
+
+            if PDF_LABEL in session.widgets:
+                timings.append(("pdf", await session.rerun(PDF_LABEL)))
+                for element_type, widget in session.widgets.values():
+                    if element_type == "download_button" and widget.url:
+                        start = time.perf_counter()
+                        await asyncio.to_thread(_download, f"http://{host}:{port}{widget.url}")
+                        results.setdefault("downloads", []).append(time.perf_counter() - start)
+        results["errors"] = results.get("errors", 0) + session.errors
+
+
+# --- Server Process Stats (Linux /proc) ---
+def process_stats(pid):
+    """``(cpu_seconds, rss_bytes)`` of a process, or None where /proc isn't available."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/status") as f:
+            rss_kb = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+    except (OSError, StopIteration):
+        return None
+    cpu_ticks = int(fields[11]) + int(fields[12])  # utime + stime
+    return cpu_ticks / os.sysconf("SC_CLK_TCK"), rss_kb * 1024
+
+
+async def run_level(host, port, sessions, loops):
+    results = {}
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(run_session(host, port, loops, seed, results) for seed in range(sessions)),
+                                    return_exceptions=True)
+    results["failed_sessions"] = sum(isinstance(outcome, BaseException) for outcome in outcomes)
+    return results, time.perf_counter() - start
+
+
+def report_header(with_process):
+    columns = f"{'sessions':>8}{'reruns':>8}{'reruns/s':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    if with_process:
+        columns += f"{'cpu %':>8}{'rss MB':>9}{'+rss MB':>9}"
+    print(columns + f"{'errors':>8}")
+
+
+def report_level(sessions, results, elapsed, cpu_percent=None, rss=None, rss_growth=None):
+    latencies = np.array([latency for _, latency in results.get("latency", [])]) * 1000
+    line = f"{sessions:>8}{len(latencies):>8}{len(latencies) / elapsed:>10.1f}"
+    if len(latencies):
+        line += "".join(f"{value:>9.0f}" for value in (*np.percentile(latencies, (50, 90, 99)), latencies.max()))
+    else:
+        line += f"{'-':>9}" * 4
+    if cpu_percent is not None:
+        line += f"{cpu_percent:>8.0f}{rss / 2**20:>9.0f}{rss_growth / 2**20:>+9.1f}"
+    print(line + f"{results.get('errors', 0) + results['failed_sessions']:>8}", flush=True)
+
+
+def report_steps(results):
+    by_step = {}
+    for step, latency in results.get("latency", []):
+        by_step.setdefault(step, []).append(latency * 1000)
+    steps = "  ".join(f"{step} {np.median(values):.0f}" for step, values in by_step.items())
+    downloads = results.get("downloads")
+    if downloads:
+        steps += f"  pdf download {np.median(downloads) * 1000:.0f}"
+    print(f"{'':>8}  median ms by step: {steps}")
+
+
+def _wait_for_server(host, port, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://{host}:{port}/_stcore/health", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"streamlit did not come up on {host}:{port}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test a Streamlit dashboard with concurrent headless sessions.")
+    parser.add_argument("--start", metavar="SCRIPT", help="start `streamlit run SCRIPT` for the duration of the test")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--pid", type=int, help="server process to measure when not using --start")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16], help="concurrency levels to run")
+    parser.add_argument("--loops", type=int, default=5, help="interaction loops per session")
+    parser.add_argument("--by-step", action="store_true", help="also print the median latency of each step")
+    args = parser.parse_args(argv)
+
+    server, pid = None, args.pid
+    if args.start:
+        server = subprocess.Popen([sys.executable, "-m", "streamlit", "run", args.start, "--server.headless", "true",
+                                   "--server.address", args.host, "--server.port", str(args.port),
+                                   "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+                                  cwd=os.path.dirname(os.path.abspath(__file__)),
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        pid = server.pid
+    try:
+        _wait_for_server(args.host, args.port)
+        baseline = process_stats(pid) if pid else None
+        report_header(baseline is not None)
+        for sessions in args.sessions:
+            before = process_stats(pid) if baseline else None
+            results, elapsed = asyncio.run(run_level(args.host, args.port, sessions, args.loops))
+            if baseline:
+                after = process_stats(pid)
+                report_level(sessions, results, elapsed, (after[0] - before[0]) / elapsed * 100, after[1],
+                             after[1] - baseline[1])
+            else:
+                report_level(sessions, results, elapsed)
+            if args.by_step:
+                report_steps(results)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import numpy as np
+
+MAX_POINTS = 2000  # points drawn per trace
+LEVEL_FACTOR = 4  # each precomputed level is this many times denser than the next coarser one
+
+
+# --- Point Selection (all functions return sorted indices into the trace) ---
+def minmax_indices(y, n_out):
+    """At most ``n_out`` points: the minimum and maximum of equal buckets, plus both end points.
+
+    Every peak and every braking trough survives by construction, and the
+    whole pass is a couple of vectorized reductions.
+    """
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    buckets = max(1, (n_out - 2) // 2)
+    size = -(-n // buckets)
+    padded = np.pad(np.asarray(y), (0, buckets * size - n), mode="edge").reshape(buckets, size)
+    starts = np.arange(buckets) * size
+    picked = np.concatenate([[0], starts + padded.argmin(axis=1), starts + padded.argmax(axis=1), [n - 1]])
+    return np.unique(np.minimum(picked, n - 1))
+
+
+# --- Zoom Levels ---
+def build_levels(y, max_points=MAX_POINTS):
+    """Min/max-downsampled index sets from coarsest (``max_points``) to finest, each
+    ``LEVEL_FACTOR`` times denser, ending below the full trace length."""
+    levels = []
+    n_out = max_points
+    while n_out < len(y):
+        levels.append(minmax_indices(y, n_out))
+        n_out *= LEVEL_FACTOR
+    return levels
+
+
+def window_indices(levels, x, y, start=None, end=None, max_points=MAX_POINTS):
+    """Indices to draw for the ``[start, end]`` x-window of a trace.
+
+    Picks the coarsest precomputed level that still has ``max_points`` inside
+    the window (the full trace when zoomed in far enough), then thins that
+    slice with min/max again, so zooming in reveals detail without ever drawing
+    more than ``max_points`` or losing a peak.
+    """
+    start = x[0] if start is None else start
+    end = x[-1] if end is None else end
+    visible = None
+    for level in levels:
+        level_x = x[level]
+        lo, hi = np.searchsorted(level_x, start, side="left"), np.searchsorted(level_x, end, side="right")
+        if hi - lo >= max_points:
+            visible = level[lo:hi]
+            break
+    if visible is None:
+        visible = np.arange(np.searchsorted(x, start, side="left"), np.searchsorted(x, end, side="right"))
+    if len(visible) > max_points:
+        visible = visible[minmax_indices(y[visible], max_points)]
+    return visible
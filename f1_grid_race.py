@@ -0,0 +1,133 @@
+import numpy as np
+
+from f1_lap_model import DEFAULT_ACCELERATION, DEFAULT_BRAKING, lap_phases
+from f1_race_sim import DEFAULT_LAPS
+from f1_strategy import COMPOUNDS, optimize_strategy
+
+# --- Grid Assumptions ---
+GRID_SIZE = 20
+START_GAP = 0.25 / 60  # minutes between grid slots as the field crosses the line on lap 1
+WORN_TYRE_FACTOR = 4.0  # past its life a tyre degrades this many times faster
+SETUP_COLUMNS = ("driver", "avg_speed_kmh", "acceleration", "braking", "pit_laps", "stints")
+
+
+# --- Default Field ---
+def default_grid(avg_speed_kmh=200.0, track_length=5000.0, n_laps=DEFAULT_LAPS, pit_duration=0.3,
+                 n_cars=GRID_SIZE, seed=0):
+    """A plausible field: setups scattered around ``avg_speed_kmh`` and the
+    default acceleration and braking, each car on one of the best pit plans.
+
+    Returns a dict of per-car lists (see SETUP_COLUMNS), in grid order.
+    """
+    rng = np.random.default_rng(seed)
+    speed = avg_speed_kmh * rng.normal(1.0, 0.01, n_cars)
+    acceleration = DEFAULT_ACCELERATION * rng.normal(1.0, 0.05, n_cars)
+    braking = DEFAULT_BRAKING * rng.normal(1.0, 0.05, n_cars)
+    # Qualifying order: quickest trapezoid lap on pole
+    lap_time = lap_phases(track_length, speed, acceleration, braking)["lap_time"]
+    order = np.argsort(lap_time)
+
+    base = float(np.nanmedian(lap_time)) / 60
+    strategies = optimize_strategy(base, n_laps, pit_duration, top_k=4) if n_laps > 1 else []
+    plans = [(strategy["pit_laps"], [name for name, _ in strategy["stints"]]) for strategy in strategies]
+    plans = plans or [([], ["Medium"])]
+    return {
+        "driver": [f"Car {i + 1}" for i in range(n_cars)],
+        "avg_speed_kmh": speed[order].round(1).tolist(),
+        "acceleration": acceleration[order].round(2).tolist(),
+        "braking": braking[order].round(2).tolist(),
+        "pit_laps": [plans[i % len(plans)][0] for i in range(n_cars)],
+        "stints": [plans[i % len(plans)][1] for i in range(n_cars)],
+    }
+
+
+def _pad(rows, fill, dtype):
+    """Ragged per-car lists as one (cars x longest) array."""
+    width = max([len(row) for row in rows] + [1])
+    padded = np.full((len(rows), width), fill, dtype=dtype)
+    for i, row in enumerate(rows):
+        padded[i, :len(row)] = row
+    return padded
+
+
+# --- Full-Grid Race ---
+def simulate_grid(cars, track_length=5000.0, n_laps=DEFAULT_LAPS, pit_duration=0.3, lap_sd=0.0,
+                  compounds=COMPOUNDS, start_gap=START_GAP, seed=None):
+    """Race a whole field lap by lap; every per-lap quantity is a (cars x laps) array.
+
+    ``cars`` maps SETUP_COLUMNS to per-car lists in grid order: each car's
+    trapezoid setup gives its base lap, ``pit_laps`` the laps after which it
+    stops and ``stints`` the compound of each stint (the last compound is
+    reused if there are fewer stints than stops + 1). Lap times are in minutes:
+    base lap + compound offset + degradation x tyre age, plus ``pit_duration``
+    on in-laps and optional normal noise. Cars do not hold each other up.
+
+    Returns a dict with ``lap_times``, ``race_time`` (cumulative, from the
+    green light), ``positions`` (1 = leading), ``gap_to_leader`` and
+    ``interval`` (to the car ahead), all (cars x laps), plus per-car
+    ``grid``, ``finish``, ``positions_gained``, ``overtakes`` and
+    ``classification`` (car indices in finishing order). Cars whose setup
+    can't complete a lap (see lap_phases) get NaN times and classify last.
+    Raises ValueError for pit laps outside 1 .. n_laps - 1 or given twice.
+    """
+    n_cars = len(cars["driver"])
+    names = list(compounds)
+    offsets, degradation, life = (np.array([compounds[name][i] for name in names], dtype=float) for i in range(3))
+
+    # Per-car base lap from the trapezoid model, in minutes like the rest of the race maths
+    base = lap_phases(track_length, np.asarray(cars["avg_speed_kmh"], dtype=float),
+                      np.asarray(cars["acceleration"], dtype=float),
+                      np.asarray(cars["braking"], dtype=float))["lap_time"] / 60
+
+    # Stops as a (cars x laps + 1) mask: column j set = pits at the end of lap j
+    for driver, row in zip(cars["driver"], cars["pit_laps"]):
+        if any(not 1 <= lap < n_laps for lap in row) or len(set(row)) < len(row):
+            raise ValueError(f"{driver}: pit laps must be different laps between 1 and {n_laps - 1}, got {row!r}")
+    pit_laps = _pad(cars["pit_laps"], 0, np.int64)
+    taken = pit_laps > 0
+    stops = np.zeros((n_cars, n_laps + 1), dtype=bool)
+    stops[np.nonzero(taken)[0], pit_laps[taken]] = True
+    stint = np.cumsum(stops[:, :n_laps], axis=1)  # stint index of every lap
+
+    # Compound and tyre age of every lap
+    for driver, row in zip(cars["driver"], cars["stints"]):
+        if not row or set(row) - set(names):
+            raise ValueError(f"{driver}: stints must name at least one of {', '.join(names)}, got {row!r}")
+    compound_index = _pad([[names.index(name) for name in row] for row in cars["stints"]], -1, np.int64)
+    last_given = (compound_index >= 0).sum(axis=1) - 1
+    compound = np.take_along_axis(compound_index, np.minimum(stint, last_given[:, None]), axis=1)
+    lap_index = np.arange(n_laps)
+    stint_start = np.maximum.accumulate(np.where(stops[:, :n_laps], lap_index, 0), axis=1)
+    age = lap_index - stint_start
+    worn = np.maximum(age - life[compound], 0)
+
+    lap_times = (base[:, None] + offsets[compound] + degradation[compound] * (age + (WORN_TYRE_FACTOR - 1) * worn)
+                 + stops[:, 1:] * pit_duration)
+    if lap_sd > 0:
+        lap_times = lap_times + np.random.default_rng(seed).normal(0.0, lap_sd, lap_times.shape)
+
+    # Standings: grid slot offset at the start, then rank the cumulative times on every lap
+    race_time = np.arange(n_cars)[:, None] * start_gap + np.cumsum(lap_times, axis=1)
+    order = np.argsort(race_time, axis=0, kind="stable")  # NaN (retired) sorts last
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(1, n_cars + 1)[:, None], axis=0)
+    sorted_time = np.take_along_axis(race_time, order, axis=0)
+    gap_to_leader = race_time - sorted_time[0]
+    interval = np.empty_like(race_time)
+    np.put_along_axis(interval, order, np.vstack([np.zeros((1, n_laps)), np.diff(sorted_time, axis=0)]), axis=0)
+
+    grid = np.arange(1, n_cars + 1)
+    running_order = np.hstack([grid[:, None], positions])
+    return {
+        "lap_times": lap_times,
+        "race_time": race_time,
+        "positions": positions,
+        "gap_to_leader": gap_to_leader,
+        "interval": interval,
+        "grid": grid,
+        "finish": positions[:, -1],
+        "positions_gained": grid - positions[:, -1],
+        "overtakes": (np.diff(running_order, axis=1) < 0).sum(axis=1),
+        "stops": stops.sum(axis=1),
+        "classification": order[:, -1],
+    }
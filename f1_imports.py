@@ -0,0 +1,102 @@
+"""Background warm-up of heavy optional imports, plus an import-cost report.
+
+    python f1_imports.py                  # cold import cost of every dependency and f1 module
+    python f1_imports.py sklearn.linear_model fpdf
+
+Each module is imported in a fresh interpreter with ``-X importtime`` so the
+numbers are true cold-start costs, not cached re-imports.
+"""
+import argparse
+import importlib
+import subprocess
+import sys
+import threading
+
+# Loaded lazily by the features that need them
+PREDICTION_IMPORTS = ("joblib", "sklearn.linear_model")
+PDF_IMPORTS = ("fpdf",)
+CHART_IMPORTS = ("matplotlib.figure", "matplotlib.backends.backend_agg", "PIL.Image")
+
+REPORT_MODULES = (
+    "streamlit", "numpy", "pandas", "matplotlib.pyplot", "matplotlib.figure", "sklearn.linear_model", "joblib",
+    "fpdf", "PIL.Image",
+    "f1_lap_model", "f1_lap_surface", "f1_track_model", "f1_prediction", "f1_summary_pdf", "f1_charts",
+    "f1_assets", "f1_metrics", "f1_race_sim", "f1_strategy", "f1_telemetry", "f1_downsample", "f1_incremental_model",
+    "f1_result_cache", "f1_ui", "f1_lap_records", "f1_grid_race",
+    "f1_vehicle_model",
+)
+
+_warmed = set()
+_warm_lock = threading.Lock()
+
+
+# --- Background Warm-Up ---
+def _import_all(modules):
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass  # the feature reports the missing dependency when it is actually used
+
+
+def warm_imports(*modules):
+    """Import ``modules`` on a daemon thread, once per process.
+
+    Call this at the end of a page script: the page has already been painted,
+    and the first use of a lazy feature then finds its dependencies loaded.
+    """
+    with _warm_lock:
+        pending = [module for module in modules if module not in _warmed]
+        _warmed.update(pending)
+    if pending:
+        threading.Thread(target=_import_all, args=(pending,), name="f1-import-warmer", daemon=True).start()
+
+
+# --- Import-Cost Report ---
+def import_cost(module):
+    """(total ms, [(ms, name) of the heaviest nested imports]) for a cold import of ``module``."""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise ImportError(completed.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = len(name) - len(name.lstrip())
+        entries.append((int(cumulative_us) / 1000, name.strip(), depth))
+    if not entries:
+        return 0.0, []
+
+    # The target is logged last with its full cost; its children precede it one level deeper
+    total_ms, _, target_depth = entries[-1]
+    children = []
+    for ms, name, depth in reversed(entries[:-1]):
+        if depth <= target_depth:
+            break  # interpreter start-up imports logged before the target
+        if depth == target_depth + 2:
+            children.append((ms, name))
+    return total_ms, sorted(children, reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the cold import cost of each dashboard dependency.")
+    parser.add_argument("modules", nargs="*", default=list(REPORT_MODULES), help="modules to measure")
+    parser.add_argument("--top", type=int, default=3, help="heaviest nested imports to list per module")
+    args = parser.parse_args(argv)
+
+    print(f"{'module':<34}{'cold import (ms)':>18}  heaviest nested imports")
+    for module in args.modules:
+        try:
+            total_ms, nested = import_cost(module)
+        except ImportError as error:
+            print(f"{module:<34}{'unavailable':>18}  {error}")
+            continue
+        heaviest = ", ".join(f"{name} {ms:.0f}" for ms, name in nested[:args.top])
+        print(f"{module:<34}{total_ms:>18.1f}  {heaviest}")
+
+
+if __name__ == "__main__":
+    main()
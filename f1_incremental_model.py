@@ -0,0 +1,202 @@
+"""Speed -> lap time models trained incrementally on large lap histories.
+
+    python f1_incremental_model.py train history.csv    # CSV columns: track, speed, lap_time
+    python f1_incremental_model.py info
+
+A linear least-squares fit only needs the sums X'X and X'y, so training keeps
+those per track and adds each mini-batch to them: memory is one CSV chunk,
+new laps are folded in without revisiting old ones, and the result is the
+same as fitting LinearRegression on every lap at once. Each update is saved
+as a new version folder of .npy arrays; readers memory-map the latest one.
+One trainer process at a time is assumed.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from f1_storage import cache_path
+
+CHUNK_ROWS = 500_000  # laps read per mini-batch
+KEEP_VERSIONS = 5  # older model versions are deleted after an update
+HISTORY_COLUMNS = ("track", "speed", "lap_time")
+
+
+def _root():
+    return os.path.dirname(cache_path("models", "incremental", "LATEST"))
+
+
+def _features(speeds):
+    # Same model as the LinearRegression in f1_prediction: intercept + slope * speed
+    speeds = np.asarray(speeds, dtype=float)
+    return np.stack([np.ones_like(speeds), speeds], axis=-1)
+
+
+# --- Versioned Artifacts ---
+def latest_version():
+    """Name of the newest model version folder, or None before the first training run."""
+    try:
+        with open(os.path.join(_root(), "LATEST")) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=4)
+def _load(version):
+    folder = os.path.join(_root(), version)
+    with open(os.path.join(folder, "tracks.json")) as f:
+        tracks = json.load(f)
+    arrays = {name: np.load(os.path.join(folder, f"{name}.npy"), mmap_mode="r")
+              for name in ("xtx", "xty", "yy", "laps", "coef")}
+    return {"version": version, "tracks": {track: i for i, track in enumerate(tracks)}, **arrays}
+
+
+def load_model(version=None):
+    """The latest (or a given) model version, memory-mapped; None if nothing was trained yet."""
+    version = version or latest_version()
+    return _load(version) if version else None
+
+
+def _empty_model():
+    k = _features(0.0).shape[-1]
+    return {"version": None, "tracks": {}, "xtx": np.zeros((0, k, k)), "xty": np.zeros((0, k)),
+            "yy": np.zeros(0), "laps": np.zeros(0, dtype=np.int64)}
+
+
+def _save(model):
+    root = _root()
+    previous = latest_version()
+    number = int(previous[1:]) + 1 if previous else 1
+    build_dir = os.path.join(root, f".build-{os.getpid()}")
+    shutil.rmtree(build_dir, ignore_errors=True)
+    os.makedirs(build_dir)
+
+    tracks = sorted(model["tracks"], key=model["tracks"].get)
+    with open(os.path.join(build_dir, "tracks.json"), "w") as f:
+        json.dump(tracks, f)
+    coef = np.stack([np.linalg.lstsq(xtx, xty, rcond=None)[0] for xtx, xty in zip(model["xtx"], model["xty"])]) \
+        if tracks else np.zeros_like(model["xty"])
+    for name, array in (("xtx", model["xtx"]), ("xty", model["xty"]), ("yy", model["yy"]), ("laps", model["laps"]),
+                        ("coef", coef)):
+        np.save(os.path.join(build_dir, f"{name}.npy"), np.asarray(array))
+
+    version = f"v{number:06d}"
+    os.replace(build_dir, os.path.join(root, version))
+    tmp_path = os.path.join(root, f"LATEST.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(version)
+    os.replace(tmp_path, os.path.join(root, "LATEST"))
+
+    for old in sorted(name for name in os.listdir(root) if name.startswith("v"))[:-KEEP_VERSIONS]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+    return version
+
+
+# --- Training ---
+def partial_fit(model, tracks, speeds, lap_times):
+    """Add one mini-batch of laps to ``model`` in place (new tracks are appended)."""
+    names, inverse = np.unique(np.asarray(tracks, dtype=str), return_inverse=True)
+    for track in names:
+        if track not in model["tracks"]:
+            model["tracks"][str(track)] = len(model["tracks"])
+    n_tracks = len(model["tracks"])
+    grow = n_tracks - len(model["laps"])
+    if grow:
+        k = model["xtx"].shape[-1]
+        model["xtx"] = np.concatenate([model["xtx"], np.zeros((grow, k, k))])
+        model["xty"] = np.concatenate([model["xty"], np.zeros((grow, k))])
+        model["yy"] = np.concatenate([model["yy"], np.zeros(grow)])
+        model["laps"] = np.concatenate([model["laps"], np.zeros(grow, dtype=np.int64)])
+
+    codes = np.array([model["tracks"][str(track)] for track in names], dtype=np.int64)[inverse.ravel()]
+    x = _features(speeds)
+    y = np.asarray(lap_times, dtype=float)
+    k = x.shape[-1]
+    # Per-track sums of the batch, one weighted bincount per matrix entry
+    for i in range(k):
+        model["xty"][:, i] += np.bincount(codes, weights=x[:, i] * y, minlength=n_tracks)
+        for j in range(k):
+            model["xtx"][:, i, j] += np.bincount(codes, weights=x[:, i] * x[:, j], minlength=n_tracks)
+    model["yy"] += np.bincount(codes, weights=y * y, minlength=n_tracks)
+    model["laps"] += np.bincount(codes, minlength=n_tracks)
+    return model
+
+
+def _mutable_copy(model):
+    if model is None:
+        return _empty_model()
+    return {"version": model["version"], "tracks": dict(model["tracks"]),
+            **{name: np.array(model[name]) for name in ("xtx", "xty", "yy", "laps")}}
+
+
+def train_csv(csv_path, chunk_rows=CHUNK_ROWS, fresh=False):
+    """Fold every lap of a history CSV into the latest model (or a fresh one) and save a new version."""
+    import pandas as pd
+
+    model = _mutable_copy(None if fresh else load_model())
+    reader = pd.read_csv(csv_path, usecols=list(HISTORY_COLUMNS), dtype={"track": str, "speed": float,
+                                                                        "lap_time": float}, chunksize=chunk_rows)
+    for chunk in reader:
+        partial_fit(model, chunk["track"].to_numpy(), chunk["speed"].to_numpy(), chunk["lap_time"].to_numpy())
+    return _save(model)
+
+
+def add_laps(laps):
+    """Fold new (track, speed, lap time) laps into the latest model and save a new version."""
+    tracks, speeds, lap_times = zip(*laps)
+    return _save(partial_fit(_mutable_copy(load_model()), tracks, speeds, lap_times))
+
+
+# --- Prediction ---
+def predict(track_name, speed, model=None):
+    """Predicted lap time at ``speed`` (scalar or array), or None when the track has no trained laps."""
+    model = model or load_model()
+    if model is None or track_name not in model["tracks"]:
+        return None
+    return (_features(speed) @ model["coef"][model["tracks"][track_name]])[()]
+
+
+def model_info(model=None):
+    """Version, and per track the lap count, coefficients and residual RMSE."""
+    model = model or load_model()
+    if model is None:
+        return None
+    info = {"version": model["version"], "tracks": {}}
+    for track, i in model["tracks"].items():
+        coef, laps = np.asarray(model["coef"][i]), int(model["laps"][i])
+        # Sum of squared residuals from the stored sums: y'y - 2 b'X'y + b'X'X b
+        sse = model["yy"][i] - 2 * coef @ model["xty"][i] + coef @ model["xtx"][i] @ coef
+        info["tracks"][track] = {"laps": laps, "intercept": float(coef[0]), "slope": float(coef[1]),
+                                 "rmse": float(np.sqrt(max(sse, 0.0) / laps)) if laps else None}
+    return info
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train and inspect the incremental lap-time models.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    train = commands.add_parser("train", help="fold a history CSV (track, speed, lap_time) into the model")
+    train.add_argument("csv")
+    train.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    train.add_argument("--fresh", action="store_true", help="start from an empty model instead of the latest")
+    commands.add_parser("info", help="show the latest model version")
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        print(f"saved {train_csv(args.csv, args.chunk_rows, args.fresh)}", file=sys.stderr)
+    info = model_info()
+    if info is None:
+        print("no model trained yet")
+        return
+    print(f"model {info['version']}")
+    for track, stats in sorted(info["tracks"].items()):
+        print(f"  {track:<14}{stats['laps']:>10} laps  lap_time = {stats['intercept']:.4f} + "
+              f"{stats['slope']:.6f} * speed  (rmse {stats['rmse']:.4f})")
+
+
+if __name__ == "__main__":
+    main()
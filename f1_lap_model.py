@@ -0,0 +1,99 @@
+import numpy as np
+
+# Convert km/h to m/s
+KMH_TO_MS = 1000 / 3600
+
+# Acceleration & Braking Assumptions (used when the caller gives none)
+DEFAULT_ACCELERATION = 4.0  # m/s² (F1 car acceleration)
+DEFAULT_BRAKING = 6.0  # m/s² (F1 car braking)
+
+
+# --- Simple Lap Time Calculator ---
+def calculate_fastest_lap(distance, speed):
+    if speed == 0:
+        return "Invalid speed!"
+    lap_time = distance / speed  # Time = Distance / Speed
+    return round(lap_time, 2)  # Rounded to 2 decimal places
+
+
+# --- Accelerate / Cruise / Brake Lap Model ---
+def lap_phases(track_length, avg_speed_kmh, acceleration=DEFAULT_ACCELERATION, braking=DEFAULT_BRAKING):
+    """Phase times (s) and distances (m) of the trapezoid lap model.
+
+    Every argument may be a scalar or a NumPy array; they are broadcast
+    against each other so a whole grid of car setups is scored in one pass.
+    Setups whose accelerate + brake distance is longer than the track (or
+    that have no speed) are flagged False in ``valid`` and get NaN for the
+    cruise phase and the lap time.
+    """
+    track_length, avg_speed_kmh, acceleration, braking = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (track_length, avg_speed_kmh, acceleration, braking))
+    )
+    avg_speed_ms = avg_speed_kmh * KMH_TO_MS
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Time to reach max speed
+        t_accel = avg_speed_ms / acceleration
+        s_accel = 0.5 * acceleration * t_accel**2
+
+        # Braking distance (before a turn) and time for braking phase
+        s_braking = avg_speed_ms**2 / (2 * braking)
+        t_braking = avg_speed_ms / braking
+
+        # Remaining track distance for steady speed
+        s_constant = track_length - (s_accel + s_braking)
+        valid = (avg_speed_ms > 0) & (s_constant >= 0)
+        s_constant = np.where(valid, s_constant, np.nan)
+        t_constant = s_constant / avg_speed_ms
+
+    # Total Lap Time
+    lap_time = t_accel + t_constant + t_braking
+
+    phases = {
+        "track_length": track_length,
+        "avg_speed_ms": avg_speed_ms,
+        "t_accel": t_accel,
+        "s_accel": s_accel,
+        "t_constant": t_constant,
+        "s_constant": s_constant,
+        "t_braking": t_braking,
+        "s_braking": s_braking,
+        "lap_time": lap_time,
+        "valid": valid,
+    }
+    # 0-d results come back as plain NumPy scalars for the single-car dashboards
+    return {key: value[()] for key, value in phases.items()}
+
+
+# --- Visualization Data ---
+def profile_points(phases):
+    """Corner points of the speed and distance traces for one lap."""
+    t_accel, t_constant = phases["t_accel"], phases["t_constant"]
+    s_accel, s_constant = phases["s_accel"], phases["s_constant"]
+    avg_speed_ms = phases["avg_speed_ms"]
+
+    time_points = [0, t_accel, t_accel + t_constant, phases["lap_time"]]
+    speed_points = [0, avg_speed_ms, avg_speed_ms, 0]
+    distance_points = [0, s_accel, s_accel + s_constant, phases["track_length"]]
+    return time_points, speed_points, distance_points
+
+
+def motion_profile(phases, n_samples=200):
+    """Time (s), speed (m/s) and distance (m) sampled evenly in time over one lap."""
+    t_accel, t_constant = phases["t_accel"], phases["t_constant"]
+    s_accel, s_constant = phases["s_accel"], phases["s_constant"]
+    avg_speed_ms = phases["avg_speed_ms"]
+    acceleration = avg_speed_ms / t_accel
+    braking = avg_speed_ms / phases["t_braking"]
+
+    time = np.linspace(0, phases["lap_time"], n_samples)
+    t_cruise_end = t_accel + t_constant
+    t_in_braking = np.clip(time - t_cruise_end, 0, None)
+
+    speed = np.where(time < t_accel, acceleration * time,
+                     np.where(time < t_cruise_end, avg_speed_ms, avg_speed_ms - braking * t_in_braking))
+    distance = np.where(time < t_accel, 0.5 * acceleration * time**2,
+                        np.where(time < t_cruise_end, s_accel + avg_speed_ms * (time - t_accel),
+                                 s_accel + s_constant + avg_speed_ms * t_in_braking
+                                 - 0.5 * braking * t_in_braking**2))
+    return time, np.maximum(speed, 0), distance
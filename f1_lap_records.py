@@ -0,0 +1,314 @@
+"""Indexed store of real lap records for the "Compare with Real F1 Fastest Lap" sections.
+
+    python f1_lap_records.py load records.csv     # columns: track, lap_time [, season, driver, session]
+    python f1_lap_records.py synth records.csv --rows 1000000
+    python f1_lap_records.py best Monza --season 2020 -n 5
+    python f1_lap_records.py stats Monza --session Q
+
+Records live in a SQLite file in the cache folder, indexed by track, season,
+driver and session with the lap time last in every index, so best-N and
+percentile queries walk an index range instead of sorting. Lap times are
+stored in seconds; the CSV loader also accepts "m:ss.sss". Until records for a
+track are loaded it keeps the built-in reference lap the pages always showed.
+Query results are cached per store version, so a rerun costs one dict lookup.
+"""
+import argparse
+import math
+import os
+import sqlite3
+import sys
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from f1_storage import cache_path
+
+# --- Built-in Reference Laps (in minutes for simplicity) ---
+REFERENCE_RECORDS = {
+    "Monza": 1.21,         # 1:21 = 81 seconds = 1.35 minutes
+    "Silverstone": 1.27,   # ~1:27 = 87 sec
+    "Spa": 1.46,           # ~1:46 = 106 sec
+    "Suzuka": 1.30         # ~1:30 = 90 sec
+}
+REFERENCE_SESSION = "reference"
+
+RECORD_COLUMNS = ("track", "season", "driver", "session", "lap_time")
+CHUNK_ROWS = 200_000  # CSV rows parsed and inserted at a time
+BULK_LOAD_BYTES = 16 * 1024 * 1024  # dumps larger than this rebuild the indexes instead of updating them
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Every index ends in lap_time: equality filters pick a range that is already sorted by time
+INDEXES = {
+    "records_time": "lap_time",
+    "records_track": "track, lap_time",
+    "records_track_season": "track, season, lap_time",
+    "records_track_session": "track, session, lap_time",
+    "records_driver": "driver, track, lap_time",
+}
+
+_local = threading.local()
+
+
+# --- Connection ---
+def _connection():
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        connection = sqlite3.connect(cache_path("lap_records.sqlite"), timeout=30, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        # Only a new store takes the write lock; readers must not queue behind a running load
+        if connection.execute("PRAGMA user_version").fetchone()[0] == 0:
+            _create_store(connection)
+        _local.connection = connection
+    return connection
+
+
+def _create_store(connection):
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        if connection.execute("PRAGMA user_version").fetchone()[0] == 0:  # another connection may have won
+            connection.execute("CREATE TABLE IF NOT EXISTS records (track TEXT NOT NULL, season INTEGER, "
+                               "driver TEXT, session TEXT, lap_time REAL NOT NULL)")
+            _create_indexes(connection)
+            # A new store starts with the reference laps the pages used to hard-code
+            connection.executemany("INSERT INTO records VALUES (?, NULL, NULL, ?, ?)",
+                                   [(track, REFERENCE_SESSION, minutes * 60)
+                                    for track, minutes in REFERENCE_RECORDS.items()])
+            connection.execute("PRAGMA user_version = 1")
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+
+
+def _create_indexes(connection):
+    for name, columns in INDEXES.items():
+        connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON records ({columns})")
+
+
+def records_version():
+    """Bumped by every load; part of every cached query's key."""
+    return _connection().execute("PRAGMA user_version").fetchone()[0]
+
+
+# --- Bulk Loading ---
+def parse_lap_times(values):
+    """Seconds from a column of numbers (seconds) or "m:ss.sss" strings; NaN where unparsable."""
+    import pandas as pd
+
+    values = pd.Series(values)
+    seconds = pd.to_numeric(values, errors="coerce")
+    if not pd.api.types.is_numeric_dtype(values):
+        parts = values.astype(str).str.split(":", n=1, expand=True)
+        if parts.shape[1] == 2:
+            clock = pd.to_numeric(parts[0], errors="coerce") * 60 + pd.to_numeric(parts[1], errors="coerce")
+            seconds = seconds.fillna(clock)
+    return seconds.to_numpy(dtype=float)
+
+
+def _text(chunk, name):
+    if name not in chunk:
+        return [None] * len(chunk)
+    column = chunk[name].str.strip()
+    return column.astype(object).where(column.notna(), None).tolist()
+
+
+def _seasons(chunk):
+    import pandas as pd
+
+    if "season" not in chunk:
+        return [None] * len(chunk)
+    season = pd.to_numeric(chunk["season"], errors="coerce")
+    return np.where(season.isna(), None, season.fillna(0).astype(np.int64).astype(object)).tolist()
+
+
+def load_csv(csv_path, chunk_rows=CHUNK_ROWS):
+    """Append a CSV record dump to the store; returns ``(loaded, skipped)`` row counts.
+
+    The file is read in chunks and inserted in one transaction, so readers see
+    either none or all of the dump. For large dumps the indexes are dropped
+    first and rebuilt once at the end, which is far cheaper than updating
+    them row by row.
+    Rows without a track or a positive lap time are skipped. Loading records
+    for a track retires its built-in reference lap.
+    """
+    import pandas as pd
+
+    connection = _connection()
+    loaded = skipped = 0
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        if os.path.getsize(csv_path) > BULK_LOAD_BYTES:
+            for name in INDEXES:
+                connection.execute(f"DROP INDEX IF EXISTS {name}")
+        reader = pd.read_csv(csv_path, usecols=lambda column: column in RECORD_COLUMNS,
+                             dtype={"track": str, "driver": str, "session": str, "lap_time": str},
+                             chunksize=chunk_rows)
+        for chunk in reader:
+            if "track" not in chunk or "lap_time" not in chunk:
+                raise ValueError(f"{csv_path} needs at least 'track' and 'lap_time' columns")
+            lap_time = parse_lap_times(chunk["lap_time"])
+            keep = chunk["track"].notna().to_numpy() & (lap_time > 0)
+            skipped += int((~keep).sum())
+            chunk, lap_time = chunk[keep], lap_time[keep]
+
+            connection.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?)",
+                                   zip(_text(chunk, "track"), _seasons(chunk), _text(chunk, "driver"),
+                                       _text(chunk, "session"), lap_time.tolist()))
+            loaded += len(chunk)
+
+        _create_indexes(connection)
+        connection.execute("DELETE FROM records WHERE session = ? AND track IN "
+                           "(SELECT DISTINCT track FROM records WHERE session IS NOT ?)",
+                           (REFERENCE_SESSION, REFERENCE_SESSION))
+        connection.execute(f"PRAGMA user_version = {records_version() + 1}")
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("ANALYZE")  # lets the planner pick between the per-filter indexes
+    return loaded, skipped
+
+
+# --- Queries ---
+def _where(track, season, driver, session):
+    filters = [(name, value) for name, value in
+               (("track", track), ("season", season), ("driver", driver), ("session", session)) if value is not None]
+    clause = " AND ".join(f"{name} = ?" for name, _ in filters)
+    return (f" WHERE {clause}" if clause else ""), [value for _, value in filters]
+
+
+@lru_cache(maxsize=1024)
+def _best_laps(track, season, driver, session, n, version):
+    where, params = _where(track, season, driver, session)
+    rows = _connection().execute(f"SELECT track, season, driver, session, lap_time FROM records{where} "
+                                 "ORDER BY lap_time LIMIT ?", (*params, n))
+    return tuple(rows)
+
+
+# The cached query results are shared by every session; callers get fresh dicts built from immutable tuples
+def best_laps(track=None, season=None, driver=None, session=None, n=10):
+    """The ``n`` fastest records matching the filters, fastest first (lap times in seconds)."""
+    return [dict(zip(RECORD_COLUMNS, row)) for row in _best_laps(track, season, driver, session, n, records_version())]
+
+
+@lru_cache(maxsize=1024)
+def _lap_percentiles(track, season, driver, session, percentiles, version):
+    where, params = _where(track, season, driver, session)
+    connection = _connection()
+    count = connection.execute(f"SELECT COUNT(*) FROM records{where}", params).fetchone()[0]
+    if count == 0:
+        return None
+    result = [("count", count)]
+    for p in percentiles:
+        # Linear interpolation between the two closest ranks, as np.percentile does
+        rank = p / 100 * (count - 1)
+        low = math.floor(rank)
+        times = [t for t, in connection.execute(f"SELECT lap_time FROM records{where} ORDER BY lap_time "
+                                                 "LIMIT 2 OFFSET ?", (*params, low))]
+        result.append((p, times[0] + (times[-1] - times[0]) * (rank - low)))
+    return tuple(result)
+
+
+def lap_percentiles(track=None, season=None, driver=None, session=None, percentiles=DEFAULT_PERCENTILES):
+    """``{"count": n, p: seconds, ...}`` over the matching records, or None when there are none."""
+    result = _lap_percentiles(track, season, driver, session, tuple(percentiles), records_version())
+    return dict(result) if result is not None else None
+
+
+@lru_cache(maxsize=1024)
+def _facets(track, version):
+    connection = _connection()
+    return tuple((name, tuple(value for value, in connection.execute(
+        f"SELECT DISTINCT {name} FROM records WHERE track = ? AND {name} IS NOT NULL AND session IS NOT ? "
+        f"ORDER BY {name}", (track, REFERENCE_SESSION))))
+        for name in ("season", "session"))
+
+
+def record_facets(track):
+    """Seasons and session types stored for a track, for filter widgets."""
+    return dict(_facets(track, records_version()))
+
+
+def record_lap_time(track, season=None, driver=None, session=None):
+    """Fastest matching lap in minutes (2 decimals, like the lap calculators), or None."""
+    best = best_laps(track, season, driver, session, n=1)
+    return round(best[0]["lap_time"] / 60, 2) if best else None
+
+
+@lru_cache(maxsize=1)
+def _tracks(version):
+    return tuple(track for track, in _connection().execute("SELECT DISTINCT track FROM records ORDER BY track"))
+
+
+def list_tracks():
+    return list(_tracks(records_version()))
+
+
+# --- Synthetic Dumps ---
+SYNTHETIC_TRACKS = {"Monza": 81.0, "Silverstone": 87.0, "Spa": 106.0, "Suzuka": 90.0, "Monaco": 72.0,
+                    "Interlagos": 70.5, "Bahrain": 91.0, "Barcelona": 76.0, "Montreal": 73.0, "Zandvoort": 71.0}
+SYNTHETIC_SESSIONS = {"FP1": 1.025, "FP2": 1.02, "FP3": 1.015, "Q": 1.0, "R": 1.03}
+
+
+def write_synthetic_csv(path, rows=1_000_000, seed=0):
+    """Record dump with plausible lap times across tracks, seasons, drivers and session types."""
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    tracks = np.array(list(SYNTHETIC_TRACKS))
+    sessions = np.array(list(SYNTHETIC_SESSIONS))
+    track_index = rng.integers(len(tracks), size=rows)
+    session_index = rng.integers(len(sessions), size=rows)
+    season = rng.integers(2000, 2025, size=rows)
+    # Cars get ~0.3 %/year faster; sessions differ by fuel and tyres; everyone has off laps
+    base = np.array(list(SYNTHETIC_TRACKS.values()))[track_index]
+    pace = np.array(list(SYNTHETIC_SESSIONS.values()))[session_index] * (1 + (2024 - season) * 0.003)
+    lap_time = base * pace * (1 + rng.gamma(2.0, 0.006, size=rows))
+    pd.DataFrame({"track": tracks[track_index], "season": season,
+                  "driver": np.char.add("Driver ", rng.integers(1, 61, size=rows).astype(str)),
+                  "session": sessions[session_index], "lap_time": lap_time.round(3)}).to_csv(path, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load and query the lap record store.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("load", help="append a CSV record dump")
+    load.add_argument("csv")
+    load.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    synth = commands.add_parser("synth", help="write a synthetic record dump")
+    synth.add_argument("csv")
+    synth.add_argument("--rows", type=int, default=1_000_000)
+    for name in ("best", "stats"):
+        query = commands.add_parser(name, help="fastest records" if name == "best" else "lap time percentiles")
+        query.add_argument("track", nargs="?")
+        query.add_argument("--season", type=int)
+        query.add_argument("--driver")
+        query.add_argument("--session")
+        if name == "best":
+            query.add_argument("-n", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == "load":
+        loaded, skipped = load_csv(args.csv, args.chunk_rows)
+        print(f"loaded {loaded:,} records ({skipped:,} skipped), {len(list_tracks())} tracks", file=sys.stderr)
+    elif args.command == "synth":
+        write_synthetic_csv(args.csv, args.rows)
+    elif args.command == "best":
+        for record in best_laps(args.track, args.season, args.driver, args.session, args.n):
+            minutes, seconds = divmod(record["lap_time"], 60)
+            print(f"{int(minutes)}:{seconds:06.3f}  {record['track']:<12} {record['season'] or '':<6} "
+                  f"{record['driver'] or '':<12} {record['session'] or ''}")
+    else:
+        stats = lap_percentiles(args.track, args.season, args.driver, args.session)
+        if stats is None:
+            print("no matching records")
+            return
+        print(f"{stats.pop('count'):,} records")
+        for p, seconds in stats.items():
+            print(f"p{p:<3} {seconds:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import itertools
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from f1_lap_model import lap_phases
+from f1_storage import cache_path
+
+# --- Grid (matches the dashboard slider ranges) ---
+TRACK_LENGTHS = np.linspace(3000, 7000, 41)  # m, every 100 m (lap time is linear in length)
+SPEEDS_KMH = np.linspace(150, 350, 201)  # km/h, every 1 km/h like the slider
+ACCELERATIONS = np.linspace(2.0, 6.0, 41)  # m/s², every 0.1
+BRAKINGS = np.linspace(4.0, 8.0, 41)  # m/s², every 0.1
+AXES = (TRACK_LENGTHS, SPEEDS_KMH, ACCELERATIONS, BRAKINGS)
+SHAPE = tuple(len(axis) for axis in AXES)
+
+
+def surface_path():
+    # The shape is part of the name so a changed grid never reads a stale table
+    return cache_path("lap_surface_" + "x".join(map(str, SHAPE)) + ".npy")
+
+
+# --- Build the Lap-Time Table ---
+def build_surface(path=None):
+    """Fill the 4-D lap-time table one track length at a time and save it as .npy."""
+    path = path or surface_path()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    table = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=SHAPE)
+    speeds, accels, brakings = np.ix_(SPEEDS_KMH, ACCELERATIONS, BRAKINGS)
+    for i, track_length in enumerate(TRACK_LENGTHS):
+        table[i] = lap_phases(track_length, speeds, accels, brakings)["lap_time"]
+    table.flush()
+    del table
+    # Atomic swap so concurrent workers never map a half-written file
+    os.replace(tmp_path, path)
+    return path
+
+
+@lru_cache(maxsize=1)
+def load_surface():
+    """Memory-mapped lap-time table, built on first use and shared by every session."""
+    path = surface_path()
+    if not os.path.exists(path):
+        build_surface(path)
+    return np.load(path, mmap_mode="r")
+
+
+# --- Lookups ---
+def _locate(axis, x):
+    x = np.clip(x, axis[0], axis[-1])
+    i = np.clip(np.searchsorted(axis, x, side="right") - 1, 0, len(axis) - 2)
+    weight = (x - axis[i]) / (axis[i + 1] - axis[i])
+    return i, weight
+
+
+def lookup_lap_time(track_length, avg_speed_kmh, acceleration, braking):
+    """Lap time (s) by multilinear interpolation in the table.
+
+    Accepts scalars or arrays. Points next to an invalid (too short track)
+    cell come back as NaN; callers fall back to lap_phases for those.
+    """
+    surface = load_surface()
+    coords = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (track_length, avg_speed_kmh, acceleration, braking))
+    )
+    located = [_locate(axis, x) for axis, x in zip(AXES, coords)]
+
+    lap_time = np.zeros(coords[0].shape)
+    for corner in itertools.product((0, 1), repeat=4):
+        index = tuple(i + c for (i, _), c in zip(located, corner))
+        weight = np.prod([w if c else 1 - w for (_, w), c in zip(located, corner)], axis=0)
+        lap_time += weight * surface[index]
+    return lap_time[()]
+
+
+def sensitivity_slice(track_length, braking):
+    """Speed x acceleration lap-time grid at the nearest stored track length and braking."""
+    surface = load_surface()
+    i = np.abs(TRACK_LENGTHS - track_length).argmin()
+    j = np.abs(BRAKINGS - braking).argmin()
+    return np.asarray(surface[i, :, :, j])
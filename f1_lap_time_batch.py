@@ -0,0 +1,183 @@
+"""Headless batch mode for the accelerate / cruise / brake lap model.
+
+Streams scenarios from a CSV or JSONL file (or stdin) and writes each row
+back with its phase breakdown and lap time:
+
+    python f1_lap_time_batch.py scenarios.csv -o results.csv --workers 8
+
+Each row needs track_length (m) and avg_speed_kmh; acceleration and braking
+(m/s²) are optional and default to the same 4 and 6 m/s² as
+f1_lap_time_dashboard.py. Any other columns (ids and the like) are passed
+through to the output.
+"""
+import argparse
+import collections
+import csv
+import io
+import itertools
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from f1_lap_model import DEFAULT_ACCELERATION, DEFAULT_BRAKING, lap_phases
+
+INPUT_FIELDS = (
+    ("track_length", None),
+    ("avg_speed_kmh", None),
+    ("acceleration", DEFAULT_ACCELERATION),
+    ("braking", DEFAULT_BRAKING),
+)
+RESULT_FIELDS = ("t_accel", "s_accel", "t_constant", "s_constant", "t_braking", "s_braking", "lap_time", "valid")
+
+
+# --- Reading & Writing ---
+def detect_format(path):
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_scenarios(stream, fmt):
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    else:
+        for number, line in enumerate(stream, 1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as error:
+                    raise ValueError(f"line {number} is not valid JSON: {error}") from None
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def csv_fields(first_row):
+    """CSV output columns: the input's own columns (ids and the like pass through), then any
+    model inputs it lacks, then the results. Every chunk is written with these."""
+    fields = [name for name in first_row if name not in RESULT_FIELDS]
+    fields += [name for name, _ in INPUT_FIELDS if name not in fields]
+    return tuple(fields) + RESULT_FIELDS
+
+
+def _number(row, name, default, number):
+    value = row.get(name)
+    if value is None or value == "":
+        if default is None:
+            raise ValueError(f"scenario {number} is missing {name!r}: {row}")
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"scenario {number}: {name!r} must be a number, got {value!r}") from None
+
+
+# --- Scoring ---
+def score_chunk(rows, first_number=1):
+    """Run one chunk of scenarios through the vectorized lap model.
+
+    ``first_number`` is the 1-based position of the chunk's first scenario in
+    the input, used in error messages.
+    """
+    columns = [np.array([_number(row, name, default, first_number + i) for i, row in enumerate(rows)])
+               for name, default in INPUT_FIELDS]
+    phases = lap_phases(*columns)
+
+    results = []
+    for i, row in enumerate(rows):
+        result = dict(row)
+        for field in RESULT_FIELDS:
+            value = phases[field][i].item()
+            # NaN is not valid JSON; blank it out for setups that don't fit the track
+            result[field] = None if isinstance(value, float) and math.isnan(value) else value
+        results.append(result)
+    return results
+
+
+def render_chunk(rows, fmt, fields=None, first_number=1):
+    """Score a chunk and format it as CSV rows (no header, ``fields`` columns) or JSON lines."""
+    results = score_chunk(rows, first_number)
+    out = io.StringIO()
+    if fmt == "jsonl":
+        for result in results:
+            out.write(json.dumps(result) + "\n")
+    else:
+        # JSONL keys the first row didn't have can't join the header any more; leave them out
+        csv.DictWriter(out, fieldnames=fields, restval="", extrasaction="ignore").writerows(results)
+    return out.getvalue()
+
+
+def _rendered_chunks(chunks, fmt, fields, workers):
+    if workers <= 1:
+        for chunk, first_number in chunks:
+            yield render_chunk(chunk, fmt, fields, first_number)
+        return
+
+    # Bounded window of in-flight chunks (Executor.map would read the whole input up front)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for chunk, first_number in chunks:
+            pending.append(pool.submit(render_chunk, chunk, fmt, fields, first_number))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run_batch(rows, stream, fmt, chunk_size=10_000, workers=1):
+    """Score scenarios and stream them to ``stream`` in input order.
+
+    Only a few chunks are held in memory at a time; with workers > 1 the
+    scoring and formatting of each chunk runs in a process pool.
+    """
+    chunks = chunked(rows, chunk_size)
+    first = next(chunks, None)
+    if first is None:
+        return
+    fields = csv_fields(first[0]) if fmt == "csv" else None
+    if fields:
+        csv.writer(stream).writerow(fields)
+    numbered = zip(itertools.chain([first], chunks), itertools.count(1, chunk_size))
+    for text in _rendered_chunks(numbered, fmt, fields, workers):
+        stream.write(text)
+
+
+# --- Command Line ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score lap-time scenarios from a CSV or JSONL file.")
+    parser.add_argument("input", help="scenario file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="result file, or - for stdout (default)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="input format (default: from the file extension)")
+    parser.add_argument("--output-format", choices=("csv", "jsonl"), help="output format (default: same as input)")
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="scenarios scored per vectorized batch")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes; 0 uses every core (default: 1, no pool)")
+    args = parser.parse_args(argv)
+
+    in_format = args.format or ("csv" if args.input == "-" else detect_format(args.input))
+    out_format = args.output_format or in_format
+    workers = args.workers or os.cpu_count() or 1
+
+    source = sys.stdin if args.input == "-" else open(args.input, newline="")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        run_batch(read_scenarios(source, in_format), sink, out_format, args.chunk_size, workers)
+    except ValueError as error:
+        sys.exit(f"error: {error}")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
 import streamlit as st
-import matplotlib.pyplot as plt
+import math
+from f1_charts import render_lap_charts, render_sensitivity_heatmap, render_telemetry_charts
+from f1_lap_model import lap_phases
+from f1_lap_surface import lookup_lap_time
+from f1_telemetry import lap_duration, list_sessions, session_laps
+from f1_vehicle_model import lap_trace
 
 # Title and Description
 st.title("Math Behind F1 Racing: The Fastest Lap")
@@ -13,55 +18,62 @@ track_length = st.slider("Track Length (meters)", 3000, 7000, 5000)
 avg_speed_kmh = st.slider("Average Speed (km/h)", 150, 350, 250)
 acceleration = st.slider("Acceleration (m/s²)", 2.0, 6.0, 4.0)
 braking = st.slider("Braking (m/s²)", 4.0, 8.0, 6.0)
+use_table = st.checkbox("⚡ Use precomputed lap-time table", value=False)
 
-# Convert km/h to m/s
-avg_speed_ms = avg_speed_kmh * (1000 / 3600)
+# Accelerate / Cruise / Brake phases and Total Lap Time
+phases = lap_phases(track_length, avg_speed_kmh, acceleration, braking)
+lap_time = phases["lap_time"]
+if not phases["valid"]:
+    st.warning("The track is too short to reach this speed and brake again. Lower the speed or raise acceleration/braking.")
+    st.stop()
 
-# Time to reach max speed
-t_accel = avg_speed_ms / acceleration  
-s_accel = 0.5 * acceleration * t_accel**2  
-
-# Braking distance (before a turn)
-s_braking = (avg_speed_ms**2) / (2 * braking)  
-
-# Remaining track distance for steady speed
-s_constant = track_length - (s_accel + s_braking)  
-t_constant = s_constant / avg_speed_ms  
-
-# Time for braking phase
-t_braking = avg_speed_ms / braking  
-
-# Total Lap Time
-lap_time = t_accel + t_constant + t_braking
+# Answer from the precomputed table when enabled (exact model is the fallback)
+if use_table:
+    table_lap_time = lookup_lap_time(track_length, avg_speed_kmh, acceleration, braking)
+    if not math.isnan(table_lap_time):
+        lap_time = table_lap_time
 
 # Display Results
 st.subheader("Estimated Lap Time:")
 st.write(f"**{lap_time:.2f} seconds**")
 
-# Visualization Data
-time_points = [0, t_accel, t_accel + t_constant, lap_time]
-speed_points = [0, avg_speed_ms, avg_speed_ms, 0]
-distance_points = [0, s_accel, s_accel + s_constant, track_length]
+# Vehicle Physics Model (engine power, drag, downforce and tyre grip; the speed above becomes a top-speed cap)
+if st.checkbox("🔬 Compare with the vehicle physics model", value=False):
+    mass = st.slider("Car Mass (kg)", 700, 900, 798)
+    power_kw = st.slider("Engine Power (kW)", 400, 900, 750)
+    drag_area = st.slider("Drag Area CdA (m²)", 0.5, 1.5, 1.0)
+    downforce_area = st.slider("Downforce Area ClA (m²)", 0.0, 5.0, 3.0)
+    grip = st.slider("Tyre Grip (μ)", 0.8, 2.0, 1.6)
+    physics = lap_trace(track_length, avg_speed_kmh, mass, power_kw * 1000, drag_area, downforce_area, grip)
+    if not physics["valid"]:
+        st.warning("This car stops gaining speed before the braking point. Raise the power or lower the drag.")
+        st.stop()
+    st.write(f"**{physics['lap_time']:.2f} seconds** with the physics model "
+             f"(peak {physics['v_peak'] * 3.6:.0f} km/h, {physics['t_braking']:.1f} s braking)")
+    st.line_chart({"Time (s)": physics["time"], "Speed (km/h)": physics["speed"] * 3.6}, x="Time (s)")
+
+# Speed vs. Time and Distance vs. Time Plots (rendered once per input and cached)
+speed_chart, distance_chart = render_lap_charts(track_length, avg_speed_kmh, acceleration, braking)
+st.image(speed_chart, use_container_width=True)
+st.image(distance_chart, use_container_width=True)
 
-# Speed vs. Time Plot
-fig1, ax1 = plt.subplots()
-ax1.plot(time_points, speed_points, label='Speed (m/s)', color='red', marker='o')
-ax1.set_title('Speed vs. Time')
-ax1.set_xlabel('Time (seconds)')
-ax1.set_ylabel('Speed (m/s)')
-ax1.grid(True)
-ax1.legend()
-st.pyplot(fig1)
+# Lap-Time Sensitivity Heatmap (read straight from the precomputed table)
+if use_table:
+    st.image(render_sensitivity_heatmap(track_length, braking, avg_speed_kmh, acceleration), use_container_width=True)
 
-# Distance vs. Time Plot
-fig2, ax2 = plt.subplots()
-ax2.plot(time_points, distance_points, label='Distance (m)', color='blue', marker='o')
-ax2.set_title('Distance vs. Time')
-ax2.set_xlabel('Time (seconds)')
-ax2.set_ylabel('Distance (m)')
-ax2.grid(True)
-ax2.legend()
-st.pyplot(fig2)
+# Recorded Telemetry (ingested with f1_telemetry.py; only the selected laps are read)
+sessions = list_sessions()
+if sessions:
+    st.subheader("Recorded Telemetry")
+    session = st.selectbox("Session", sessions)
+    laps = st.multiselect("Laps", session_laps(session).tolist(), default=session_laps(session)[:1].tolist())
+    if laps:
+        # Zooming in draws more detail of the window, never more than a few thousand points per lap
+        lap_seconds = math.ceil(max(lap_duration(session, lap) for lap in laps))
+        window = st.slider("Zoom (seconds into the lap)", 0, lap_seconds, (0, lap_seconds))
+        telemetry_speed, telemetry_distance = render_telemetry_charts(session, laps, window)
+        st.image(telemetry_speed, use_container_width=True)
+        st.image(telemetry_distance, use_container_width=True)
 
 st.markdown("""
 ---
@@ -1,22 +1,27 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-from PIL import Image
+import math
+from f1_assets import BACKGROUND_WIDTH, asset_url
+from f1_charts import render_lap_animation, render_lap_charts, render_sensitivity_heatmap
+from f1_imports import CHART_IMPORTS, warm_imports
+from f1_lap_model import lap_phases
+from f1_lap_surface import lookup_lap_time
 
 # Load and Display Background Image
 
 
-# Custom CSS for Transparent Containers
-st.markdown("""
+# Custom CSS for Transparent Containers (background is a pre-scaled copy of f1_image3.jpg, served as a static file)
+background_url = asset_url("f1_image3.jpg", BACKGROUND_WIDTH)
+st.markdown(f"""
     <style>
-    body {
-        background: url('f1_image3.jpg') no-repeat center center fixed; background-size: cover;
+    body {{
+        background: url('{background_url}') no-repeat center center fixed; background-size: cover;
         background-size: cover;
         background-attachment: fixed;
-    }
-    .stApp {
+    }}
+    .stApp {{
         background: transparent;
-    }
-    .reportview-container .main .block-container{
+    }}
+    .reportview-container .main .block-container{{
         background: rgba(0, 0, 0, 0.5);
         border-radius: 15px;
         padding: 25px;
@@ -24,10 +29,10 @@ st.markdown("""
         background: rgba(0, 0, 0, 0.6);
         padding: 20px;
         border-radius: 10px;
-    }
-    h1, h2, h3, h4, h5, h6, p, label {
+    }}
+    h1, h2, h3, h4, h5, h6, p, label {{
         color: white;
-    }
+    }}
     </style>
     """, unsafe_allow_html=True)
 
@@ -44,63 +49,46 @@ track_length = st.sidebar.slider("Track Length (meters)", 3000, 7000, 5000)
 avg_speed_kmh = st.sidebar.slider("Average Speed (km/h)", 150, 350, 250)
 acceleration = st.sidebar.slider("Acceleration (m/s²)", 2.0, 6.0, 4.0)
 braking = st.sidebar.slider("Braking (m/s²)", 4.0, 8.0, 6.0)
-
-# Convert km/h to m/s
-avg_speed_ms = avg_speed_kmh * (1000 / 3600)
-
-# Time to reach max speed
-t_accel = avg_speed_ms / acceleration  
-s_accel = 0.5 * acceleration * t_accel**2  
-
-# Braking distance (before a turn)
-s_braking = (avg_speed_ms**2) / (2 * braking)  
-
-# Remaining track distance for steady speed
-s_constant = track_length - (s_accel + s_braking)  
-t_constant = s_constant / avg_speed_ms  
-
-# Time for braking phase
-t_braking = avg_speed_ms / braking  
-
-# Total Lap Time
-lap_time = t_accel + t_constant + t_braking
+use_table = st.sidebar.checkbox("⚡ Use precomputed lap-time table", value=False)
+animate = st.sidebar.checkbox("🎬 Animate charts", value=False)
+
+# Accelerate / Cruise / Brake phases and Total Lap Time
+phases = lap_phases(track_length, avg_speed_kmh, acceleration, braking)
+lap_time = phases["lap_time"]
+if not phases["valid"]:
+    st.warning("The track is too short to reach this speed and brake again. Lower the speed or raise acceleration/braking.")
+    st.stop()
+
+# Answer from the precomputed table when enabled (exact model is the fallback)
+if use_table:
+    table_lap_time = lookup_lap_time(track_length, avg_speed_kmh, acceleration, braking)
+    if not math.isnan(table_lap_time):
+        lap_time = table_lap_time
 
 # Display Results with Styling
 st.markdown("<h2 style='color: #FF5757;'>Estimated Lap Time:</h2>", unsafe_allow_html=True)
 st.markdown(f"<h1 style='color: #FFF700;'>{lap_time:.2f} seconds</h1>", unsafe_allow_html=True)
 
-# Visualization Data
-time_points = [0, t_accel, t_accel + t_constant, lap_time]
-speed_points = [0, avg_speed_ms, avg_speed_ms, 0]
-distance_points = [0, s_accel, s_accel + s_constant, track_length]
-
-# Speed vs. Time Plot
-fig1, ax1 = plt.subplots()
-ax1.plot(time_points, speed_points, label='Speed (m/s)', color='#FF5757', marker='o')
-ax1.set_title('Speed vs. Time', color='white')
-ax1.set_xlabel('Time (seconds)', color='white')
-ax1.set_ylabel('Speed (m/s)', color='white')
-ax1.grid(True, linestyle='--', alpha=0.5)
-ax1.legend()
-ax1.tick_params(colors='white')
-fig1.patch.set_alpha(0.85)
-ax1.set_facecolor('black')
+# Speed vs. Time and Distance vs. Time Plots (rendered once per input and cached)
+# Animations are encoded once per input and the same GIF is served to every session
+if animate:
+    speed_chart = render_lap_animation(track_length, avg_speed_kmh, acceleration, braking, "speed", style="dark")
+    distance_chart = render_lap_animation(track_length, avg_speed_kmh, acceleration, braking, "distance", style="dark")
+else:
+    speed_chart, distance_chart = render_lap_charts(track_length, avg_speed_kmh, acceleration, braking, style="dark")
 st.markdown("<h3 style='color: #FF5757;'>Speed vs. Time</h3>", unsafe_allow_html=True)
-st.pyplot(fig1)
-
-# Distance vs. Time Plot
-fig2, ax2 = plt.subplots()
-ax2.plot(time_points, distance_points, label='Distance (m)', color='#FFF700', marker='o')
-ax2.set_title('Distance vs. Time', color='white')
-ax2.set_xlabel('Time (seconds)', color='white')
-ax2.set_ylabel('Distance (m)', color='white')
-ax2.grid(True, linestyle='--', alpha=0.5)
-ax2.legend()
-ax2.tick_params(colors='white')
-fig2.patch.set_alpha(0.85)
-ax2.set_facecolor('black')
+st.image(speed_chart, use_container_width=True)
 st.markdown("<h3 style='color: #FFF700;'>Distance vs. Time</h3>", unsafe_allow_html=True)
-st.pyplot(fig2)
+st.image(distance_chart, use_container_width=True)
+
+# Lap-Time Sensitivity Heatmap (read straight from the precomputed table)
+if use_table:
+    st.markdown("<h3 style='color: #FF5757;'>Lap Time Sensitivity</h3>", unsafe_allow_html=True)
+    st.image(render_sensitivity_heatmap(track_length, braking, avg_speed_kmh, acceleration, style="dark"),
+             use_container_width=True)
 
 st.markdown("<hr>", unsafe_allow_html=True)
 st.markdown("<p style='text-align: center; color: #FFF700;'>🏎️ Adjust the sliders and see how lap times change in real-time!</p>", unsafe_allow_html=True)
+
+# Page is painted; load the animation encoder in the background so the first "Animate charts" is quicker
+warm_imports(*CHART_IMPORTS)
@@ -0,0 +1,136 @@
+"""Opt-in per-section timing for the Streamlit dashboards.
+
+Set F1_METRICS=1 to enable. Every timed section appends one JSON line to
+<cache>/metrics/sections.jsonl; rolling p50/p90/p99 per page and section,
+plus the result cache hit/miss counters, are written in Prometheus text
+format to <cache>/metrics/sections.prom (for a textfile collector) and, when
+F1_METRICS_PORT is set, served on http://127.0.0.1:<port>/metrics. When disabled, sections cost one flag check.
+"""
+import collections
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from f1_result_cache import cache_stats
+from f1_storage import cache_path
+
+ENABLED = os.environ.get("F1_METRICS", "").lower() in ("1", "true", "yes")
+METRICS_PORT = int(os.environ.get("F1_METRICS_PORT", "0"))
+WINDOW = 1000  # most recent samples kept per (page, section) for the percentiles
+EXPORT_INTERVAL = 5.0  # seconds between rewrites of the .prom file
+QUANTILES = (0.5, 0.9, 0.99)
+
+_lock = threading.Lock()
+_samples = collections.defaultdict(lambda: collections.deque(maxlen=WINDOW))
+_totals = collections.defaultdict(lambda: [0.0, 0])  # (page, section) -> [sum of ms, count]
+_last_export = 0.0
+_log_file = None
+_server = None
+
+
+# --- Recording ---
+def record(page, name, duration_ms):
+    global _log_file, _last_export
+    entry = {"ts": time.time(), "page": page, "section": name, "ms": round(duration_ms, 3), "pid": os.getpid()}
+    with _lock:
+        if _log_file is None:
+            _log_file = open(cache_path("metrics", "sections.jsonl"), "a", buffering=1)
+        _log_file.write(json.dumps(entry) + "\n")
+        key = (page, name)
+        _samples[key].append(duration_ms)
+        _totals[key][0] += duration_ms
+        _totals[key][1] += 1
+        export_due = time.monotonic() - _last_export >= EXPORT_INTERVAL
+        if export_due:
+            _last_export = time.monotonic()
+    if export_due:
+        _write_prometheus_file()
+
+
+@contextmanager
+def section(page, name):
+    """Time the enclosed block as one section of a page rerun (no-op unless F1_METRICS is set)."""
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(page, name, (time.perf_counter() - start) * 1000)
+
+
+def page_timer(page):
+    """``section`` bound to one page: ``with sections("ai_prediction"): ...``."""
+    _start_server()
+    return partial(section, page)
+
+
+# --- Export ---
+def render_prometheus():
+    with _lock:
+        snapshot = {key: (np.array(samples), *_totals[key]) for key, samples in _samples.items()}
+
+    lines = [
+        "# HELP f1_section_duration_ms Dashboard rerun section duration in milliseconds (rolling window).",
+        "# TYPE f1_section_duration_ms summary",
+    ]
+    for (page, name), (samples, total_ms, count) in sorted(snapshot.items()):
+        labels = f'page="{page}",section="{name}"'
+        for q, value in zip(QUANTILES, np.quantile(samples, QUANTILES)):
+            lines.append(f'f1_section_duration_ms{{{labels},quantile="{q}"}} {value:.3f}')
+        lines.append(f"f1_section_duration_ms_sum{{{labels}}} {total_ms:.3f}")
+        lines.append(f"f1_section_duration_ms_count{{{labels}}} {count}")
+
+    lines += [
+        "# HELP f1_result_cache_total Result cache lookups by outcome, and disk evictions, in this process.",
+        "# TYPE f1_result_cache_total counter",
+    ]
+    for function, counts in sorted(cache_stats().items()):
+        for outcome in ("memory_hits", "disk_hits", "misses", "evictions"):
+            lines.append(f'f1_result_cache_total{{function="{function}",outcome="{outcome}"}} {counts[outcome]}')
+    return "\n".join(lines) + "\n"
+
+
+def _write_prometheus_file():
+    path = cache_path("metrics", "sections.prom")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(render_prometheus())
+    os.replace(tmp_path, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep scrapes out of the Streamlit log
+
+
+def _start_server():
+    global _server
+    if not ENABLED or not METRICS_PORT or _server is not None:
+        return
+    with _lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer(("127.0.0.1", METRICS_PORT), _MetricsHandler)
+            except OSError:
+                _server = False  # port taken (e.g. by another worker); the .prom file still has the data
+                return
+            threading.Thread(target=_server.serve_forever, name="f1-metrics", daemon=True).start()
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from f1_incremental_model import predict as predict_from_history
+from f1_storage import cache_path
+
+# Simulated past data (Speed in km/h, Lap Time in minutes)
+SAMPLE_DATA = {
+    "Monza": [(180, 1.5), (200, 1.3), (220, 1.2), (240, 1.1)],
+    "Silverstone": [(180, 1.6), (200, 1.4), (220, 1.3), (240, 1.2)],
+    "Spa": [(180, 1.8), (200, 1.6), (220, 1.5), (240, 1.4)],
+    "Suzuka": [(180, 1.7), (200, 1.5), (220, 1.4), (240, 1.3)],
+}
+
+# track name -> (training data fingerprint, fitted model / (coef, intercept)), shared by every session
+_models = {}
+_linear_terms = {}
+_lock = threading.Lock()
+
+
+def _fingerprint(track_name, data):
+    payload = json.dumps([track_name, [[float(v) for v in point] for point in data]])
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _load_or_fit(track_name, data, fingerprint):
+    # sklearn and joblib are heavy; they load the first time a model is needed, not at page import
+    import joblib
+    from sklearn.linear_model import LinearRegression
+
+    path = cache_path("models", f"{track_name}-{fingerprint}.joblib")
+    if os.path.exists(path):
+        try:
+            return joblib.load(path)
+        except Exception:
+            pass  # unreadable or written by another sklearn version: refit below
+
+    points = np.asarray(data, dtype=float)
+    model = LinearRegression()
+    model.fit(points[:, :1], points[:, 1])
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, path)
+    return model
+
+
+# --- Model Registry ---
+def get_model(track_name, data=None):
+    """Speed -> lap time regression for a track, fitted once per training data.
+
+    The model is kept for the life of the process and serialized to disk, so
+    it is only refitted when the (speed, lap time) points change.
+    """
+    data = SAMPLE_DATA[track_name] if data is None else data
+    fingerprint = _fingerprint(track_name, data)
+
+    cached = _models.get(track_name)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    with _lock:
+        cached = _models.get(track_name)
+        if cached is None or cached[0] != fingerprint:
+            cached = (fingerprint, _load_or_fit(track_name, data, fingerprint))
+            _models[track_name] = cached
+        return cached[1]
+
+
+def _load_linear_terms(track_name, data, fingerprint):
+    path = cache_path("models", f"{track_name}-{fingerprint}.json")
+    try:
+        with open(path) as f:
+            terms = json.load(f)
+        return terms["coef"], terms["intercept"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    model = get_model(track_name, data)
+    coef, intercept = float(model.coef_[0]), float(model.intercept_)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"coef": coef, "intercept": intercept}, f)
+    os.replace(tmp_path, path)
+    return coef, intercept
+
+
+def predict_lap_time(track_name, speed, data=None):
+    """Predicted lap time (minutes) at the given average speed (km/h).
+
+    A fitted LinearRegression is just a line, so its slope and intercept are
+    kept next to the serialized model; once they are on disk, predictions
+    need neither sklearn nor joblib. Without explicit ``data``, a model trained
+    on lap history with f1_incremental_model takes precedence over SAMPLE_DATA.
+    """
+    if data is None:
+        predicted = predict_from_history(track_name, speed)
+        if predicted is not None:
+            return predicted
+    data = SAMPLE_DATA[track_name] if data is None else data
+    fingerprint = _fingerprint(track_name, data)
+
+    cached = _linear_terms.get(track_name)
+    if cached is None or cached[0] != fingerprint:
+        cached = (fingerprint, _load_linear_terms(track_name, data, fingerprint))
+        _linear_terms[track_name] = cached
+    coef, intercept = cached[1]
+    return intercept + coef * speed
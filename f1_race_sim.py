@@ -0,0 +1,100 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# --- Race Assumptions ---
+DEFAULT_LAPS = 53
+DEFAULT_LAP_SD = 0.01  # lap-to-lap spread, in the same unit as the lap time (minutes on the dashboards)
+DEFAULT_PIT_SD = 0.05  # spread of one pit stop, same unit
+DEFAULT_SAFETY_CAR_PROBABILITY = 0.02  # chance a safety car is deployed on any given lap
+SAFETY_CAR_LAPS = 4  # laps one deployment lasts
+SAFETY_CAR_SLOWDOWN = 1.4  # lap time factor behind the safety car
+SAFETY_CAR_PIT_FACTOR = 0.5  # a stop under the safety car loses about half the usual time
+PERCENTILES = (5, 25, 50, 75, 95)
+
+CHUNK_SIZE = 25_000  # races simulated per array batch (bounds memory to a few MB per worker)
+PARALLEL_THRESHOLD = 200_000  # below this, process start-up costs more than it saves
+
+_pools = {}  # worker count -> pool
+_pool_lock = threading.Lock()
+
+
+def _simulate_chunk(seed, n_races, n_laps, lap_time, lap_sd, pit_stops, pit_duration, pit_sd,
+                    safety_car_probability):
+    rng = np.random.default_rng(seed)
+
+    # Safety car: a deployment on lap i neutralises laps i .. i + SAFETY_CAR_LAPS - 1
+    deployed = rng.random((n_races, n_laps)) < safety_car_probability
+    deployments = np.cumsum(deployed, axis=1)
+    lagged = np.zeros_like(deployments)
+    lagged[:, SAFETY_CAR_LAPS:] = deployments[:, :-SAFETY_CAR_LAPS]
+    under_safety_car = deployments > lagged
+    safety_car_laps = under_safety_car.sum(axis=1)
+    green_laps = n_laps - safety_car_laps
+
+    # Green-flag noise is a sum of independent normals, so draw the per-race total directly
+    total = (green_laps * lap_time + safety_car_laps * lap_time * SAFETY_CAR_SLOWDOWN
+             + rng.standard_normal(n_races) * lap_sd * np.sqrt(green_laps))
+
+    if pit_stops > 0 and pit_duration > 0:
+        # Gamma-distributed stop times (always positive) with the requested mean and spread
+        if pit_sd > 0:
+            shape, scale = (pit_duration / pit_sd) ** 2, pit_sd**2 / pit_duration
+            stop_times = rng.gamma(shape, scale, (n_races, pit_stops))
+        else:
+            stop_times = np.full((n_races, pit_stops), float(pit_duration))
+        # Stops are spread evenly over the race; cheaper when they fall under a safety car
+        pit_laps = (np.arange(1, pit_stops + 1) * n_laps) // (pit_stops + 1)
+        stop_times = np.where(under_safety_car[:, pit_laps], stop_times * SAFETY_CAR_PIT_FACTOR, stop_times)
+        total += stop_times.sum(axis=1)
+    return total
+
+
+def _get_pool(workers):
+    with _pool_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            # Long-lived pools, so dashboard reruns don't pay the start-up again. The Streamlit server
+            # is multithreaded, and forking a threaded process can deadlock the children: start them
+            # from a clean forkserver (or spawn where there is none) instead
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers,
+                                                         mp_context=multiprocessing.get_context(method))
+        return pool
+
+
+# --- Monte Carlo Race Simulation ---
+def simulate_races(lap_time, n_laps=DEFAULT_LAPS, lap_sd=DEFAULT_LAP_SD, pit_stops=1, pit_duration=0.3,
+                   pit_sd=DEFAULT_PIT_SD, safety_car_probability=DEFAULT_SAFETY_CAR_PROBABILITY,
+                   n_races=100_000, seed=None, workers=None):
+    """Finishing times of ``n_races`` simulated races around a base lap time.
+
+    ``lap_time`` is the expected green-flag lap (e.g. from calculate_fastest_lap
+    or the trapezoid model); all times share its unit. Races are simulated in
+    chunks with independent random streams, so results for a given seed are
+    identical whether the chunks run in this process or across the pool.
+
+    Returns a dict with ``finish_times`` (array), ``mean``, ``std`` and
+    ``percentiles`` (percentile -> finishing time).
+    """
+    chunk_sizes = [CHUNK_SIZE] * (n_races // CHUNK_SIZE) + ([n_races % CHUNK_SIZE] if n_races % CHUNK_SIZE else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    params = (n_laps, float(lap_time), lap_sd, int(pit_stops), pit_duration, pit_sd, safety_car_probability)
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and n_races >= PARALLEL_THRESHOLD:
+        pool = _get_pool(workers)
+        chunks = list(pool.map(_simulate_chunk, seeds, chunk_sizes, *([p] * len(seeds) for p in params)))
+    else:
+        chunks = [_simulate_chunk(s, size, *params) for s, size in zip(seeds, chunk_sizes)]
+
+    finish_times = np.concatenate(chunks)
+    return {
+        "finish_times": finish_times,
+        "mean": float(finish_times.mean()),
+        "std": float(finish_times.std()),
+        "percentiles": dict(zip(PERCENTILES, np.percentile(finish_times, PERCENTILES))),
+    }
@@ -1,28 +1,16 @@
 import streamlit as st
-
-# Simple Lap Time Calculator
-def calculate_fastest_lap(distance, speed):
-    if speed == 0:
-        return "Invalid speed!"
-    lap_time = distance / speed  # Time = Distance / Speed
-    return round(lap_time, 2)  # Rounded to 2 decimal places
-
-# Available Track Layouts (Images must be in the same folder as this script)
-track_layouts = {
-    "Monza": "monza.png",
-    "Silverstone": "Silverstone.png",
-    "Spa": "Spa.png",
-    "Suzuka": "Suzuka.png"
-}
+from f1_assets import track_image
+from f1_lap_model import calculate_fastest_lap
+from f1_ui import TRACK_LAYOUTS
 
 # Streamlit UI
 st.title("🏎️ F1 Fastest Lap Calculator 🏁")
 
 # Select Track
-selected_track = st.selectbox("Choose a Track:", list(track_layouts.keys()))
+selected_track = st.selectbox("Choose a Track:", list(TRACK_LAYOUTS.keys()))
 
 # Show Track Image
-st.image(track_layouts[selected_track], caption=f"{selected_track} Track Layout", use_container_width=True)
+st.image(track_image(TRACK_LAYOUTS[selected_track]), caption=f"{selected_track} Track Layout", use_container_width=True)
 
 # User Inputs for Lap Calculation
 st.subheader("Calculate Fastest Lap Time")
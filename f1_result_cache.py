@@ -0,0 +1,239 @@
+"""Two-tier result cache shared by every session and kept across restarts.
+
+    python f1_result_cache.py stats      # entries and bytes on disk per function
+    python f1_result_cache.py clear
+
+``@persistent_cache()`` keys a function's result on its canonicalized
+arguments (positional or keyword, defaults filled in, NumPy scalars as plain
+numbers) and on a hash of the source of the module defining it, so editing
+that module retires its old results. A per-process LRU answers repeated calls without I/O; behind it a
+SQLite file in the cache folder is shared by all worker processes and
+survives restarts. Entries expire after ``max_age`` seconds, and the least recently
+used disk entries are dropped once the file holds more than
+F1_RESULT_CACHE_MB. Results are pickled, so cache functions that return
+immutable values (bytes, numbers, tuples).
+"""
+import argparse
+import collections
+import functools
+import hashlib
+import inspect
+import json
+import numbers
+import os
+import pickle
+import sys
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from f1_storage import cache_path
+
+DISK_MAX_BYTES = int(float(os.environ.get("F1_RESULT_CACHE_MB", "256")) * 1024 * 1024)
+DEFAULT_MAX_AGE = 7 * 24 * 3600  # seconds
+DEFAULT_MAXSIZE = 128  # in-process entries per function
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+_stats = collections.defaultdict(lambda: {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0})
+
+
+# --- Keys ---
+def _canonical(value):
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        # np.float64(2.5) and 2.5 share a key; 200 and 200.0 don't, as results may print them differently
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return ["ndarray", value.dtype.str, value.shape, hashlib.sha256(np.ascontiguousarray(value)).hexdigest()]
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in sorted(value.items())}
+    raise TypeError(f"cannot build a cache key from {type(value).__name__}")
+
+
+def cache_key(namespace, signature, args, kwargs):
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    payload = json.dumps([namespace, {name: _canonical(value) for name, value in bound.arguments.items()}])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# --- Disk Tier ---
+def _connection():
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        connection = sqlite3.connect(cache_path("results.sqlite"), timeout=5, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, namespace TEXT, value BLOB, "
+                           "size INTEGER, created REAL, accessed REAL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        _local.connection = connection
+    return connection
+
+
+def _disk_get(key, max_age):
+    now = time.time()
+    row = _connection().execute("SELECT value, created FROM results WHERE key = ?", (key,)).fetchone()
+    if row is None or now - row[1] > max_age:
+        return None
+    _connection().execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+    return row
+
+
+def _disk_put(key, namespace, blob, max_age):
+    now = time.time()
+    connection = _connection()
+    connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                       (key, namespace, blob, len(blob), now, now))
+    evicted = connection.execute("DELETE FROM results WHERE namespace = ? AND created < ?",
+                                 (namespace, now - max_age)).rowcount
+    total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+    if total > DISK_MAX_BYTES:
+        # Drop the least recently used entries until the file is back under its budget
+        victims = []
+        for victim, size in connection.execute("SELECT key, size FROM results ORDER BY accessed"):
+            if total <= DISK_MAX_BYTES:
+                break
+            victims.append((victim,))
+            total -= size
+        connection.executemany("DELETE FROM results WHERE key = ?", victims)
+        evicted += len(victims)
+    return evicted
+
+
+def _drop_stale(name, namespace):
+    """Delete results another version of the same function's code left behind."""
+    _connection().execute("DELETE FROM results WHERE namespace != ? AND substr(namespace, 1, ?) = ?",
+                          (namespace, len(name) + 1, f"{name}@"))
+
+
+def code_version(func):
+    """Short hash of the source of ``func``'s module (of ``func`` alone if that isn't available)."""
+    try:
+        source = inspect.getsource(sys.modules[func.__module__])
+    except (KeyError, OSError, TypeError):
+        try:
+            source = inspect.getsource(func)
+        except (OSError, TypeError):
+            source = func.__code__.co_code.hex()
+    return hashlib.sha256(source.encode()).hexdigest()[:12]
+
+
+# --- Decorator ---
+def persistent_cache(namespace=None, maxsize=DEFAULT_MAXSIZE, max_age=DEFAULT_MAX_AGE, version=""):
+    """Cache a function's results in memory (``maxsize`` entries) and in the shared SQLite tier.
+
+    ``namespace`` defaults to the function's module and name. Results are
+    also keyed on the source of the function's module, so disk entries from
+    older code are never served (and are deleted on the first new write).
+    Bump ``version`` when the output changes because of code elsewhere,
+    e.g. in a model the function calls.
+    """
+    def decorate(func):
+        name = namespace or f"{func.__module__}.{func.__qualname__}"
+        full_namespace = f"{name}@{code_version(func)}{version}"
+        signature = inspect.signature(func)
+        memory = collections.OrderedDict()  # key -> (created, value)
+        lock = threading.Lock()
+        stats = _stats[name]
+        stale = [True]  # older versions' disk entries still to be dropped
+
+        def count(field, amount=1):
+            with _stats_lock:
+                stats[field] += amount
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = cache_key(full_namespace, signature, args, kwargs)
+            now = time.time()
+            with lock:
+                entry = memory.get(key)
+                if entry is not None and now - entry[0] <= max_age:
+                    memory.move_to_end(key)
+                    count("memory_hits")
+                    return entry[1]
+
+            try:
+                row = _disk_get(key, max_age)
+            except sqlite3.Error:
+                row = None  # a locked or unwritable cache file only costs the recomputation
+            if row is not None:
+                value, now = pickle.loads(row[0]), row[1]  # keeps its original age in memory too
+                count("disk_hits")
+            else:
+                value = func(*args, **kwargs)
+                count("misses")
+                try:
+                    if stale[0]:
+                        _drop_stale(name, full_namespace)
+                        stale[0] = False
+                    count("evictions", _disk_put(key, full_namespace, pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+                                                 max_age))
+                except sqlite3.Error:
+                    pass
+
+            with lock:
+                memory[key] = (now, value)
+                memory.move_to_end(key)
+                while len(memory) > maxsize:
+                    memory.popitem(last=False)
+            return value
+
+        def cache_clear():
+            with lock:
+                memory.clear()
+
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_namespace = full_namespace
+        return wrapper
+    return decorate
+
+
+# --- Statistics ---
+def cache_stats():
+    """Per-function hit/miss/eviction counts of this process, with the hit ratio."""
+    with _stats_lock:
+        snapshot = {name: dict(counts) for name, counts in _stats.items()}
+    for counts in snapshot.values():
+        calls = counts["memory_hits"] + counts["disk_hits"] + counts["misses"]
+        counts["hit_ratio"] = (calls - counts["misses"]) / calls if calls else 0.0
+    return snapshot
+
+
+def disk_usage():
+    """``{namespace: (entries, bytes)}`` currently in the shared SQLite tier."""
+    rows = _connection().execute("SELECT namespace, COUNT(*), SUM(size) FROM results GROUP BY namespace")
+    return {namespace: (entries, size) for namespace, entries, size in rows}
+
+
+def clear_disk():
+    _connection().execute("DELETE FROM results")
+    _connection().execute("VACUUM")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or clear the shared result cache.")
+    parser.add_argument("command", choices=["stats", "clear"])
+    args = parser.parse_args(argv)
+    if args.command == "clear":
+        clear_disk()
+        return
+    usage = disk_usage()
+    print(f"{'function':<56}{'entries':>9}{'KiB':>11}")
+    for namespace, (entries, size) in sorted(usage.items()):
+        print(f"{namespace:<56}{entries:>9}{size / 1024:>11.1f}")
+    total = sum(size for _, size in usage.values())
+    print(f"{'total':<56}{sum(e for e, _ in usage.values()):>9}{total / 1024:>11.1f}  "
+          f"(limit {DISK_MAX_BYTES / 1024:.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import streamlit as st
+
+
+# --- Dependency Graph of Page Sections ---
+class SectionGraph:
+    """Page computations declared with their inputs, memoized in session state.
+
+    Inputs are either page values set with ``set_inputs`` (widget values) or
+    the names of other sections. ``get`` only reruns a section when one of
+    its resolved inputs differs from the previous rerun, so results survive
+    reruns and unrelated widget changes cost nothing.
+    """
+
+    def __init__(self, state, prefix="_section_"):
+        self._state = state
+        self._prefix = prefix
+        self._sections = {}
+        self._inputs = {}
+
+    def section(self, *inputs):
+        def register(func):
+            self._sections[func.__name__] = (func, inputs)
+            return func
+        return register
+
+    def set_inputs(self, **values):
+        self._inputs.update(values)
+
+    def get(self, name):
+        func, inputs = self._sections[name]
+        args = {dep: self.get(dep) if dep in self._sections else self._inputs[dep] for dep in inputs}
+
+        key = self._prefix + name
+        cached = self._state.get(key)
+        if cached is not None and cached[0] == args:
+            return cached[1]
+        value = func(**args)
+        self._state[key] = (args, value)
+        return value
+
+
+def fragment(func):
+    """``st.fragment`` where available (Streamlit >= 1.33), otherwise a plain full-page rerun."""
+    decorator = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    return decorator(func) if decorator else func
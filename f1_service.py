@@ -0,0 +1,274 @@
+"""Local HTTP/JSON service for the lap models, for tools that don't drive a Streamlit page.
+
+    python f1_service.py --port 8765 --max-wait-ms 2
+
+    POST /fastest_lap  {"distance": 5.0, "speed": 200}
+    POST /trapezoid    {"track_length": 5000, "avg_speed_kmh": 250, "acceleration": 4, "braking": 6}
+    POST /predict      {"track": "Monza", "speed": 200}
+    GET  /health
+
+Requests arriving together are queued per endpoint and scored as one
+vectorized micro-batch (at most --max-batch items, waiting at most
+--max-wait-ms for the batch to fill). When an endpoint's queue is full the
+service answers 503 with Retry-After instead of queueing without bound.
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+from collections import defaultdict
+
+import numpy as np
+
+from f1_incremental_model import load_model
+from f1_lap_time_batch import INPUT_FIELDS, score_chunk
+from f1_prediction import SAMPLE_DATA, predict_lap_time
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_WAIT_MS = 2.0
+DEFAULT_QUEUE_LIMIT = 1024  # queued requests per endpoint before answering 503
+MAX_BODY_BYTES = 64 * 1024
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _number(payload, name, default=None):
+    value = payload.get(name)
+    if value is None:
+        if default is None:
+            raise BadRequest(f"missing {name!r}")
+        return default
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise BadRequest(f"{name!r} must be a number") from None
+    if not math.isfinite(value):
+        raise BadRequest(f"{name!r} must be finite")
+    return value
+
+
+# --- Endpoints: parse one request, score a whole batch ---
+def _parse_fastest_lap(payload):
+    distance, speed = _number(payload, "distance"), _number(payload, "speed")
+    if speed == 0:
+        raise BadRequest("Invalid speed!")
+    return distance, speed
+
+
+def _score_fastest_lap(items):
+    # One division for the whole batch, then Python's round() so answers match calculate_fastest_lap
+    distance, speed = np.array(items, dtype=float).T
+    return [{"lap_time": round(lap_time, 2)} for lap_time in (distance / speed).tolist()]
+
+
+def _parse_trapezoid(payload):
+    return {name: _number(payload, name, default) for name, default in INPUT_FIELDS}
+
+
+def _score_trapezoid(items):
+    # Same vectorized scoring (and NaN -> null handling) as the batch CLI
+    return score_chunk(items)
+
+
+def _parse_predict(payload):
+    track = payload.get("track")
+    if not isinstance(track, str):
+        raise BadRequest("'track' must be a string")
+    history = load_model()
+    if track not in SAMPLE_DATA and (history is None or track not in history["tracks"]):
+        raise BadRequest(f"unknown track {track!r}")
+    return track, _number(payload, "speed")
+
+
+def _score_predict(items):
+    by_track = defaultdict(list)
+    for i, (track, _) in enumerate(items):
+        by_track[track].append(i)
+    results = [None] * len(items)
+    for track, indices in by_track.items():
+        speeds = np.array([items[i][1] for i in indices])
+        for i, lap_time in zip(indices, np.atleast_1d(predict_lap_time(track, speeds))):
+            results[i] = {"track": track, "speed": items[i][1], "lap_time": float(lap_time)}
+    return results
+
+
+ENDPOINTS = {
+    "/fastest_lap": (_parse_fastest_lap, _score_fastest_lap),
+    "/trapezoid": (_parse_trapezoid, _score_trapezoid),
+    "/predict": (_parse_predict, _score_predict),
+}
+
+
+# --- Micro-Batching ---
+class MicroBatcher:
+    """Collects submitted items and scores them together.
+
+    A batch is closed when it holds ``max_batch`` items or ``max_wait``
+    seconds after its first item arrived, whichever comes first. The queue
+    is bounded: ``submit`` raises asyncio.QueueFull when it is at capacity.
+    """
+
+    def __init__(self, score, max_batch=DEFAULT_MAX_BATCH, max_wait=DEFAULT_MAX_WAIT_MS / 1000,
+                 queue_limit=DEFAULT_QUEUE_LIMIT):
+        self._score = score
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._queue = asyncio.Queue(queue_limit)
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future))
+        return future
+
+    @property
+    def queued(self):
+        return self._queue.qsize()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait
+            while len(batch) < self._max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            items = [item for item, _ in batch]
+            try:
+                results = self._score(items)
+            except Exception as error:  # one failure answers the whole batch with 500
+                results = [error] * len(items)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue  # client went away
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+            self.batches += 1
+            self.items += len(batch)
+
+
+# --- HTTP ---
+class LapService:
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS, queue_limit=DEFAULT_QUEUE_LIMIT):
+        self._settings = (max_batch, max_wait_ms / 1000, queue_limit)
+        self._batchers = {}
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        for path, (_, score) in ENDPOINTS.items():
+            self._batchers[path] = MicroBatcher(score, *self._settings)
+        self._tasks = [asyncio.create_task(batcher.run()) for batcher in self._batchers.values()]
+        return await asyncio.start_server(self._handle, host, port)
+
+    def _health(self):
+        return {"status": "ok", "endpoints": {
+            path: {"queued": b.queued, "batches": b.batches, "mean_batch": b.items / b.batches if b.batches else 0.0}
+            for path, b in self._batchers.items()}}
+
+    async def _dispatch(self, method, path, body):
+        if path == "/health":
+            return (200, self._health()) if method == "GET" else (405, {"error": "use GET"})
+        if path not in ENDPOINTS:
+            return 404, {"error": f"unknown endpoint {path!r}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            payload = json.loads(body or b"{}")
+            if not isinstance(payload, dict):
+                raise BadRequest("body must be a JSON object")
+            item = ENDPOINTS[path][0](payload)
+        except (BadRequest, ValueError) as error:
+            return 400, {"error": str(error)}
+        try:
+            future = self._batchers[path].submit(item)
+        except asyncio.QueueFull:
+            return 503, {"error": "overloaded, retry later"}
+        try:
+            return 200, await future
+        except Exception as error:
+            return 500, {"error": str(error)}
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    self._respond(writer, 413, {"error": f"body larger than {MAX_BODY_BYTES} bytes"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self._dispatch(method, path.split("?")[0], body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                self._respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # client hung up or sent something that isn't HTTP
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        headers = [f"HTTP/1.1 {status} {REASONS[status]}", "Content-Type: application/json",
+                   f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if status == 503:
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+
+
+async def serve(host, port, max_batch, max_wait_ms, queue_limit):
+    server = await LapService(max_batch, max_wait_ms, queue_limit).start(host, port)
+    print(f"serving on http://{host}:{port} (max batch {max_batch}, max wait {max_wait_ms} ms)", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the lap models over local HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="largest micro-batch")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="longest a request waits for its batch to fill")
+    parser.add_argument("--queue-limit", type=int, default=DEFAULT_QUEUE_LIMIT,
+                        help="queued requests per endpoint before answering 503")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch, args.max_wait_ms, args.queue_limit))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Load test for f1_service.py: throughput and latency percentiles under concurrent clients.
+
+    python f1_service_load_test.py --start --concurrency 64 --requests 20000
+    python f1_service_load_test.py --port 8765 --endpoint predict --duration 10
+
+Each client keeps one HTTP/1.1 connection open and sends requests back to
+back. 503 answers (backpressure) are counted separately from errors.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from f1_prediction import SAMPLE_DATA
+from f1_service import DEFAULT_PORT
+
+
+def _payload(endpoint, rng):
+    if endpoint == "fastest_lap":
+        return {"distance": round(rng.uniform(3, 7), 2), "speed": int(rng.integers(150, 350))}
+    if endpoint == "trapezoid":
+        return {"track_length": round(rng.uniform(3000, 7000)), "avg_speed_kmh": round(rng.uniform(150, 250)),
+                "acceleration": round(rng.uniform(2, 6), 1), "braking": round(rng.uniform(4, 8), 1)}
+    return {"track": str(rng.choice(list(SAMPLE_DATA))), "speed": int(rng.integers(150, 350))}
+
+
+async def _client(host, port, endpoint, seed, stop, results):
+    rng = np.random.default_rng(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while not stop():
+            body = json.dumps(_payload(endpoint, rng)).encode()
+            request = (f"POST /{endpoint} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+            start = time.perf_counter()
+            writer.write(request)
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            results.append((time.perf_counter() - start, status))
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, endpoint, concurrency, total_requests=None, duration=None):
+    results = []
+    deadline = time.perf_counter() + duration if duration else None
+
+    def stop():
+        if deadline is not None:
+            return time.perf_counter() >= deadline
+        return len(results) >= total_requests
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, endpoint, seed, stop, results) for seed in range(concurrency)))
+    return results, time.perf_counter() - start
+
+
+def report(results, elapsed):
+    latencies = np.array([latency for latency, _ in results]) * 1000
+    statuses = np.array([status for _, status in results])
+    ok = statuses == 200
+    print(f"requests      {len(results)} in {elapsed:.2f} s")
+    print(f"throughput    {ok.sum() / elapsed:,.0f} ok req/s")
+    print(f"rejected 503  {(statuses == 503).sum()}")
+    print(f"errors        {(~ok & (statuses != 503)).sum()}")
+    if ok.any():
+        p50, p90, p99 = np.percentile(latencies[ok], (50, 90, 99))
+        print(f"latency ms    p50 {p50:.2f}  p90 {p90:.2f}  p99 {p99:.2f}  max {latencies[ok].max():.2f}")
+
+
+def _wait_for_server(host, port, timeout=15.0):
+    import urllib.request
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://{host}:{port}/health", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"f1_service did not come up on {host}:{port}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the lap model service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--endpoint", choices=["fastest_lap", "trapezoid", "predict"], default="trapezoid")
+    parser.add_argument("--concurrency", type=int, default=64, help="concurrent keep-alive clients")
+    parser.add_argument("--requests", type=int, default=20_000, help="total requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, help="run for this many seconds instead")
+    parser.add_argument("--start", action="store_true", help="start f1_service.py for the duration of the test")
+    parser.add_argument("--server-args", default="", help="extra f1_service.py arguments with --start")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.start:
+        server = subprocess.Popen([sys.executable, "f1_service.py", "--host", args.host, "--port", str(args.port),
+                                   *args.server_args.split()], cwd=os.path.dirname(os.path.abspath(__file__)))
+        _wait_for_server(args.host, args.port)
+    try:
+        results, elapsed = asyncio.run(run_load(args.host, args.port, args.endpoint, args.concurrency,
+                                                args.requests, args.duration))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    report(results, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+import os
+
+# Where precomputed tables, fitted models and other generated artifacts live
+CACHE_DIR = os.environ.get("F1_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".f1_cache"))
+
+
+def cache_path(*parts):
+    """Path inside CACHE_DIR, creating the parent folder on first use."""
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
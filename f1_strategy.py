@@ -0,0 +1,98 @@
+import heapq
+
+import numpy as np
+
+# --- Tyre Compounds ---
+# name -> (pace offset per lap, degradation per lap of tyre age, tyre life in laps); times in minutes
+COMPOUNDS = {
+    "Soft": (-0.010, 0.0025, 25),
+    "Medium": (0.0, 0.0012, 38),
+    "Hard": (0.008, 0.0006, 55),
+}
+DEFAULT_TOP_K = 5
+
+
+def _distinct_best(entries, top_k):
+    """The ``top_k`` fastest (time, stints) entries with different sets of stints.
+
+    Stint order doesn't change the race time, so Hard 31 -> Medium 22 and
+    Medium 22 -> Hard 31 are the same strategy; the first found stands for both.
+    """
+    heap = list(entries)
+    heapq.heapify(heap)  # pop only as far as needed instead of sorting every candidate
+    chosen, seen = [], set()
+    while heap and len(chosen) < top_k:
+        time, stints = heapq.heappop(heap)
+        key = tuple(sorted(stints))
+        if key not in seen:
+            seen.add(key)
+            chosen.append((time, stints))
+    return chosen
+
+
+def stint_costs(base_lap_time, n_laps, compounds=COMPOUNDS):
+    """Time of a stint of 0..n_laps laps on fresh tyres of each compound (inf beyond tyre life)."""
+    laps = np.arange(n_laps + 1)
+    costs = {}
+    for name, (offset, degradation, life) in compounds.items():
+        # lap i of a stint costs base + offset + degradation * i, so a stint of L laps sums to:
+        cost = laps * (base_lap_time + offset) + degradation * laps * (laps - 1) / 2
+        costs[name] = np.where(laps <= life, cost, np.inf).tolist()
+    return costs
+
+
+def strategy_time(base_lap_time, pit_duration, stints, compounds=COMPOUNDS):
+    """Race time of a given strategy, ``stints`` being (compound, laps) pairs."""
+    costs = stint_costs(base_lap_time, max(laps for _, laps in stints), compounds)
+    return sum(costs[name][laps] for name, laps in stints) + pit_duration * (len(stints) - 1)
+
+
+# --- Strategy Optimizer ---
+def optimize_strategy(base_lap_time, n_laps, pit_duration, compounds=COMPOUNDS, top_k=DEFAULT_TOP_K,
+                      min_stint=1, require_two_compounds=True):
+    """The ``top_k`` fastest pit strategies over ``n_laps``, as dicts with the total
+    ``time``, the ``stops`` count, the ``pit_laps`` and the ``stints``.
+
+    Race time only depends on where each stint ends and on which compound it
+    was run, so this is a k-best dynamic programme over (laps completed,
+    current compound, whether a second compound was already used): every
+    state keeps its ``top_k`` best prefixes, which is enough because a top-k
+    strategy can only extend a top-k prefix. That is O(laps² · compounds² · k)
+    instead of enumerating every combination of stop laps and compounds.
+    Strategies that only differ in the order of their stints are kept once.
+    """
+    costs = stint_costs(base_lap_time, n_laps, compounds)
+    names = list(compounds)
+
+    # best[lap][(compound, mixed)] -> up to top_k (time, stints) prefixes, sorted
+    best = [dict() for _ in range(n_laps + 1)]
+    for lap in range(min_stint, n_laps + 1):
+        for name in names:
+            if costs[name][lap] < np.inf:
+                best[lap][(name, False)] = [(costs[name][lap], ((name, lap),))]
+
+    for lap in range(min_stint, n_laps + 1):
+        for name in names:
+            stint = costs[name]
+            by_state = {(name, False): [], (name, True): []}
+            for start in range(max(min_stint, lap - len(stint) + 1), lap - min_stint + 1):
+                cost = stint[lap - start]
+                if cost == np.inf:
+                    continue
+                added = cost + pit_duration
+                for (previous, mixed), prefixes in best[start].items():
+                    state = (name, mixed or previous != name)
+                    by_state[state].extend((time + added, stints + ((name, lap - start),))
+                                           for time, stints in prefixes)
+            for state, found in by_state.items():
+                found.extend(best[lap].get(state, ()))
+                if found:
+                    best[lap][state] = _distinct_best(found, top_k)
+
+    finishes = [entry for (name, mixed), entries in best[n_laps].items()
+                if mixed or not require_two_compounds for entry in entries]
+    strategies = []
+    for time, stints in _distinct_best(finishes, top_k):
+        pit_laps = np.cumsum([laps for _, laps in stints])[:-1].tolist()
+        strategies.append({"time": time, "stops": len(stints) - 1, "pit_laps": pit_laps, "stints": list(stints)})
+    return strategies
@@ -0,0 +1,26 @@
+from f1_result_cache import persistent_cache
+
+
+# --- Function to Generate PDF Summary ---
+@persistent_cache(maxsize=256)
+def generate_lap_summary_pdf(track_name, speed, lap_time):
+    """Lap summary as PDF bytes, built in memory.
+
+    Identical (track, speed, lap time) requests are served from the shared result
+    cache; bytes are immutable, so one cached document is safe to hand to every session.
+    """
+    from fpdf import FPDF  # loaded on the first export, not at page import
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+
+    pdf.cell(200, 10, txt="F1 Fastest Lap Summary", ln=True, align='C')
+    pdf.ln(10)
+    pdf.cell(200, 10, txt=f"Track Selected: {track_name}", ln=True)
+    pdf.cell(200, 10, txt=f"Speed Entered: {speed} km/h", ln=True)
+    pdf.cell(200, 10, txt=f"Calculated Lap Time: {lap_time} minutes", ln=True)
+
+    # PyFPDF returns a latin-1 str, fpdf2 a bytearray
+    pdf_output = pdf.output(dest="S")
+    return pdf_output.encode("latin-1") if isinstance(pdf_output, str) else bytes(pdf_output)
@@ -0,0 +1,240 @@
+"""Columnar on-disk store for per-lap telemetry.
+
+    python f1_telemetry.py ingest session.csv --session monza-fp1
+    python f1_telemetry.py synth monza.csv --track Monza --laps 50 --hz 100
+    python f1_telemetry.py list
+
+A CSV with lap, time, distance, speed, throttle and brake columns is read in
+chunks (never whole) and stored as one typed .npy file per column, rows
+grouped by lap, plus a lap -> row range index. Pages memory-map only the
+columns they plot and copy only the rows of the laps they show. Every ingest
+writes a new version folder inside the session and then points LATEST at it,
+so readers always see a complete session.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from f1_storage import cache_path
+
+# Column -> on-disk dtype; times and distances keep float64 precision over a whole session
+TELEMETRY_COLUMNS = {
+    "lap": np.int32,
+    "time": np.float64,
+    "distance": np.float64,
+    "speed": np.float32,
+    "throttle": np.float32,
+    "brake": np.float32,
+}
+CHUNK_ROWS = 500_000  # CSV rows parsed at a time
+KEEP_VERSIONS = 2  # older versions of a session are deleted after an ingest
+
+
+def session_dir(session):
+    return os.path.join(os.path.dirname(cache_path("telemetry", session)), session)
+
+
+def _version_dir(session, version):
+    return os.path.join(session_dir(session), version)
+
+
+# --- Ingestion ---
+def ingest_csv(csv_path, session, chunk_rows=CHUNK_ROWS):
+    """Convert a telemetry CSV into the columnar store and return its row count.
+
+    Chunks are appended to raw per-column files, so memory stays at one chunk
+    whatever the file size. Rows are then grouped by lap (a stable sort, so
+    time order within a lap is kept; skipped when the file is already in lap
+    order) and written as .npy. The data goes into a new version folder and the
+    session's LATEST pointer is replaced at the end, so readers never see a
+    half-written session.
+    """
+    import pandas as pd
+
+    root = session_dir(session)
+    previous = _latest(session)
+    number = int(previous[1:]) + 1 if previous else 1
+    build_dir = os.path.join(root, f".build-{os.getpid()}")
+    shutil.rmtree(build_dir, ignore_errors=True)
+    os.makedirs(build_dir)
+
+    raw_files = {name: open(os.path.join(build_dir, f"{name}.raw"), "wb") for name in TELEMETRY_COLUMNS}
+    rows, in_lap_order, last_lap = 0, True, None
+    try:
+        reader = pd.read_csv(csv_path, usecols=list(TELEMETRY_COLUMNS), dtype=TELEMETRY_COLUMNS,
+                             chunksize=chunk_rows)
+        for chunk in reader:
+            laps = chunk["lap"].to_numpy()
+            if len(laps):
+                in_lap_order &= bool((np.diff(laps) >= 0).all()) and (last_lap is None or laps[0] >= last_lap)
+                last_lap = laps[-1]
+            for name, f in raw_files.items():
+                chunk[name].to_numpy().tofile(f)
+            rows += len(chunk)
+    finally:
+        for f in raw_files.values():
+            f.close()
+
+    raw = {name: np.memmap(os.path.join(build_dir, f"{name}.raw"), dtype=dtype, mode="r", shape=(rows,))
+           if rows else np.empty(0, dtype) for name, dtype in TELEMETRY_COLUMNS.items()}
+    order = None if in_lap_order else np.argsort(raw["lap"], kind="stable")
+    for name, dtype in TELEMETRY_COLUMNS.items():
+        column = np.lib.format.open_memmap(os.path.join(build_dir, f"{name}.npy"), mode="w+", dtype=dtype,
+                                           shape=(rows,))
+        column[:] = raw[name] if order is None else raw[name][order]
+        column.flush()
+        if name == "lap":
+            lap_numbers, starts = np.unique(column, return_index=True)
+            np.save(os.path.join(build_dir, "laps.npy"), lap_numbers)
+            np.save(os.path.join(build_dir, "offsets.npy"), np.append(starts, rows).astype(np.int64))
+        del column
+    del raw
+    for name in TELEMETRY_COLUMNS:
+        os.remove(os.path.join(build_dir, f"{name}.raw"))
+
+    stat = os.stat(csv_path)
+    with open(os.path.join(build_dir, "meta.json"), "w") as f:
+        json.dump({"rows": rows, "columns": {name: np.dtype(dtype).str for name, dtype in TELEMETRY_COLUMNS.items()},
+                   "source": {"path": os.path.abspath(csv_path), "size": stat.st_size, "mtime": stat.st_mtime}}, f)
+
+    version = f"v{number:06d}"
+    os.replace(build_dir, os.path.join(root, version))
+    tmp_path = os.path.join(root, f"LATEST.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(version)
+    os.replace(tmp_path, os.path.join(root, "LATEST"))
+
+    for old in sorted(name for name in os.listdir(root) if name.startswith("v"))[:-KEEP_VERSIONS]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+    return rows
+
+
+# --- Reading ---
+def _latest(session):
+    try:
+        with open(os.path.join(session_dir(session), "LATEST")) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def list_sessions():
+    """Sessions with at least one complete ingest."""
+    root = os.path.dirname(session_dir("_"))
+    return sorted(name for name in os.listdir(root)
+                  if not name.startswith(".") and not name.endswith(".tmp") and _latest(name))
+
+
+def session_version(session):
+    """Name of the session's current version folder; changes whenever the session is re-ingested."""
+    version = _latest(session)
+    if version is None:
+        raise KeyError(f"no telemetry session {session!r}")
+    return version
+
+
+@lru_cache(maxsize=64)
+def _load(session, name, version):
+    return np.load(os.path.join(_version_dir(session, version), f"{name}.npy"), mmap_mode="r")
+
+
+def session_laps(session):
+    """Lap numbers stored for a session."""
+    return np.asarray(_load(session, "laps", session_version(session)))
+
+
+def load_laps(session, laps=None, columns=("time", "speed")):
+    """``{column: array}`` for the requested laps (all when None), in lap order.
+
+    Only the named columns are opened, and only the rows of those laps are
+    read from disk; a single lap comes back as a zero-copy view of the map.
+    """
+    version = session_version(session)
+    lap_numbers = _load(session, "laps", version)
+    offsets = _load(session, "offsets", version)
+    if laps is None:
+        ranges = [(offsets[0], offsets[-1])]
+    else:
+        index = np.searchsorted(lap_numbers, laps)
+        if ((index >= len(lap_numbers)) | (lap_numbers[np.minimum(index, len(lap_numbers) - 1)] != laps)).any():
+            raise KeyError(f"{session} has no lap(s) {sorted(set(np.atleast_1d(laps)) - set(lap_numbers))}")
+        ranges = [(offsets[i], offsets[i + 1]) for i in np.atleast_1d(index)]
+
+    result = {}
+    for name in columns:
+        column = _load(session, name, version)
+        parts = [column[start:end] for start, end in ranges]
+        result[name] = parts[0] if len(parts) == 1 else np.concatenate(parts)
+    return result
+
+
+def lap_duration(session, lap):
+    """Seconds from the first to the last sample of a lap."""
+    time = load_laps(session, [lap], ("time",))["time"]
+    return float(time[-1] - time[0])
+
+
+# --- Synthetic Sessions ---
+def write_synthetic_csv(path, track_name, laps=10, hz=100, seed=0):
+    """Telemetry CSV for ``laps`` laps of the track model, sampled at ``hz``, with lap-to-lap noise."""
+    from f1_track_model import speed_profile
+
+    profile = speed_profile(track_name)
+    speed, distance = profile["speed"], profile["distance"]
+    lap_time_points = np.concatenate([[0.0], np.cumsum(np.diff(distance) * 2 / (speed[1:] + speed[:-1]))])
+    rng = np.random.default_rng(seed)
+
+    with open(path, "w") as f:
+        f.write(",".join(TELEMETRY_COLUMNS) + "\n")
+        session_time, session_distance = 0.0, 0.0
+        for lap in range(1, laps + 1):
+            # Each lap is the model lap run slightly faster or slower, with sensor noise on top
+            pace = rng.normal(1.0, 0.005)
+            t = np.arange(0, lap_time_points[-1] * pace, 1 / hz)
+            lap_distance = np.interp(t / pace, lap_time_points, distance)
+            model_speed = np.interp(t / pace, lap_time_points, speed) / pace
+            accel = np.gradient(model_speed, t)
+            lap_speed = model_speed + rng.normal(0, 0.3, len(t))
+            throttle = np.clip(50 + accel * 25, 0, 100)
+            brake = (accel < -5).astype(float)
+            np.savetxt(f, np.column_stack([np.full(len(t), lap), session_time + t, session_distance + lap_distance,
+                                           lap_speed, throttle, brake]),
+                       fmt=["%d", "%.3f", "%.2f", "%.2f", "%.1f", "%d"], delimiter=",")
+            session_time += t[-1] + 1 / hz
+            session_distance += distance[-1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest and inspect telemetry sessions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="convert a telemetry CSV into the columnar store")
+    ingest.add_argument("csv")
+    ingest.add_argument("--session", help="session name (default: the CSV file name)")
+    ingest.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    synth = commands.add_parser("synth", help="write a synthetic telemetry CSV from the track model")
+    synth.add_argument("csv")
+    synth.add_argument("--track", default="Monza")
+    synth.add_argument("--laps", type=int, default=10)
+    synth.add_argument("--hz", type=int, default=100)
+    commands.add_parser("list", help="list stored sessions")
+    args = parser.parse_args(argv)
+
+    if args.command == "ingest":
+        session = args.session or os.path.splitext(os.path.basename(args.csv))[0]
+        rows = ingest_csv(args.csv, session, args.chunk_rows)
+        print(f"{session}: {rows} rows, {len(session_laps(session))} laps -> "
+              f"{_version_dir(session, session_version(session))}", file=sys.stderr)
+    elif args.command == "synth":
+        write_synthetic_csv(args.csv, args.track, args.laps, args.hz)
+    else:
+        for session in list_sessions():
+            print(session, len(session_laps(session)), "laps")
+
+
+if __name__ == "__main__":
+    main()
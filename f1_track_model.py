@@ -0,0 +1,144 @@
+from functools import lru_cache
+
+import numpy as np
+
+from f1_lap_model import DEFAULT_ACCELERATION, DEFAULT_BRAKING, KMH_TO_MS
+
+# --- Circuit Descriptions ---
+# Each circuit is a sequence of (length in m, corner radius in m); radius None is a straight.
+# Layouts are simplified approximations of the real circuits, in racing direction from the start line.
+TRACK_SEGMENTS = {
+    "Monza": [
+        (1120, None), (50, 20), (60, 25),  # main straight, Variante del Rettifilo
+        (550, 350), (350, None),  # Curva Biassono
+        (50, 25), (60, 25),  # Variante della Roggia
+        (280, None), (110, 90), (150, None), (90, 60),  # Lesmo 1 & 2
+        (1000, None),  # Serraglio
+        (60, 50), (80, 70), (70, 60),  # Variante Ascari
+        (1050, None), (280, 110),  # back straight, Parabolica
+        (383, None),
+    ],
+    "Silverstone": [
+        (300, None), (160, 120), (150, 60),  # Abbey, Farm
+        (300, None), (80, 25), (200, None), (90, 35),  # Village, The Loop, Aintree
+        (770, None), (100, 45),  # Wellington Straight, Brooklands
+        (120, 30), (250, None),  # Luffield
+        (300, 200), (250, None),  # Woodcote, Copse
+        (180, 180), (120, 220), (110, 150), (100, 200), (80, 100),  # Maggotts, Becketts, Chapel
+        (1020, None), (80, 45),  # Hangar Straight, Stowe
+        (250, None), (90, 30), (80, 25),  # Vale, Club
+        (711, None),
+    ],
+    "Spa": [
+        (300, None), (60, 18),  # La Source
+        (450, None), (200, 130), (50, 180),  # Eau Rouge, Raidillon
+        (1800, None), (90, 55), (60, 65),  # Kemmel Straight, Les Combes
+        (400, None), (140, 50),  # Malmedy to Bruxelles
+        (300, None), (90, 60),  # Speakers' Corner
+        (300, None), (250, 130),  # Pouhon
+        (200, None), (70, 70), (80, 65),  # Fagnes
+        (300, None), (120, 80),  # Stavelot
+        (700, None), (200, 300), (300, None),  # Blanchimont
+        (40, 15), (40, 20),  # Bus Stop chicane
+        (464, None),
+    ],
+    "Suzuka": [
+        (700, None), (180, 120), (100, 70),  # Turns 1 & 2
+        (120, 90), (120, 80), (120, 100), (100, 90),  # S Curves
+        (120, 60), (350, None),  # Dunlop
+        (120, 50), (100, 45),  # Degner 1 & 2
+        (450, None), (100, 25),  # Hairpin
+        (500, 350), (300, None),  # 200R
+        (180, 60), (150, 70), (300, None),  # Spoon
+        (1000, None), (150, 250),  # Back straight, 130R
+        (100, None), (50, 15), (50, 20),  # Casio Triangle
+        (347, None),
+    ],
+}
+
+# Default car setup for the solver
+DEFAULT_TOP_SPEED_KMH = 330.0
+DEFAULT_LATERAL_ACCEL = 30.0  # m/s², roughly 3 g of cornering grip with downforce
+DEFAULT_STEP = 1.0  # m between distance samples
+
+
+# --- Discretization ---
+@lru_cache(maxsize=32)
+def _sampled_radius(track_name, step):
+    segments = TRACK_SEGMENTS[track_name]
+    lengths = np.array([length for length, _ in segments], dtype=float)
+    radii = np.array([np.inf if radius is None else radius for _, radius in segments], dtype=float)
+
+    n_samples = int(round(lengths.sum() / step))
+    distance = np.arange(n_samples) * step
+    segment_index = np.searchsorted(np.cumsum(lengths), distance, side="right")
+    radius = radii[np.minimum(segment_index, len(segments) - 1)]
+    distance.flags.writeable = radius.flags.writeable = False  # shared between callers
+    return distance, radius
+
+
+def track_length(track_name):
+    return float(sum(length for length, _ in TRACK_SEGMENTS[track_name]))
+
+
+# --- Speed Profile Solver ---
+def _forward_pass(cap_sq, accel, step):
+    # v²[j] = min over i <= j of (cap²[i] + 2·a·ds·(j - i)): a running minimum, no Python loop
+    ramp = 2 * accel * step * np.arange(cap_sq.shape[-1])
+    return np.minimum.accumulate(cap_sq - ramp, axis=-1) + ramp
+
+
+def _backward_pass(cap_sq, braking, step):
+    # Same recurrence in reverse: the car must be able to brake down to every later limit
+    return _forward_pass(cap_sq[..., ::-1], braking, step)[..., ::-1]
+
+
+def speed_profile(track_name, acceleration=DEFAULT_ACCELERATION, braking=DEFAULT_BRAKING,
+                  top_speed_kmh=DEFAULT_TOP_SPEED_KMH, lateral_accel=DEFAULT_LATERAL_ACCEL,
+                  step=DEFAULT_STEP, flying_lap=True):
+    """Speed profile and lap time of one or many car setups around a circuit.
+
+    Setup arguments may be scalars or 1-D arrays (one entry per setup); they
+    are solved together in one batched call. The speed at each sample is the
+    minimum of the corner limit, a forward pass limited by acceleration and a
+    backward pass limited by braking. A flying lap carries speed over the line;
+    otherwise the lap starts from standstill and ends at the line without
+    braking.
+
+    Returns a dict with ``distance`` (m, per sample), ``speed`` (m/s,
+    setups x samples) and ``lap_time`` (s, per setup).
+    """
+    distance, radius = _sampled_radius(track_name, step)
+    setups = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float)) for x in (acceleration, braking, top_speed_kmh, lateral_accel))
+    )
+    accel, brake, top_speed, lateral = (x[:, None] for x in setups)
+
+    # Corner limit v² = a_lat · r, capped by top speed (straights have r = inf)
+    cap_sq = np.minimum(lateral * radius, (top_speed * KMH_TO_MS) ** 2)
+
+    if flying_lap:
+        # Start the lap at the tightest corner: no other limit can bind there, so the car is exactly
+        # at its corner speed and the lap closes on itself without simulating a run-up lap
+        start = int(np.argmin(radius))
+        cap_sq = np.roll(cap_sq, -start, axis=1)
+        cap_sq = np.concatenate([cap_sq, cap_sq[:, :1]], axis=1)
+    else:
+        cap_sq = np.concatenate([cap_sq, cap_sq[:, -1:]], axis=1)  # finish line, no braking to stop
+        cap_sq[:, 0] = 0.0  # standstill start
+    v_sq = np.minimum(_forward_pass(cap_sq, accel, step), _backward_pass(cap_sq, brake, step))
+
+    speed = np.sqrt(np.maximum(v_sq, 0.0))
+    # Constant acceleration between samples: dt = 2·ds / (v_i + v_i+1)
+    lap_time = (2 * step / (speed[:, :-1] + speed[:, 1:])).sum(axis=1)
+
+    speed = speed[:, :-1]
+    if flying_lap:
+        speed = np.roll(speed, start, axis=1)
+
+    squeeze = all(np.ndim(x) == 0 for x in (acceleration, braking, top_speed_kmh, lateral_accel))
+    return {
+        "distance": distance,
+        "speed": speed[0] if squeeze else speed,
+        "lap_time": lap_time[0] if squeeze else lap_time,
+    }
@@ -0,0 +1,35 @@
+import streamlit as st
+
+# --- Track Layouts (images live next to the scripts) ---
+TRACK_LAYOUTS = {
+    "Monza": "monza.png",
+    "Silverstone": "Silverstone.png",
+    "Spa": "Spa.png",
+    "Suzuka": "Suzuka.png"
+}
+
+# --- Custom CSS Styling of the dark calculator pages ---
+DARK_THEME_CSS = """
+    <style>
+        body {
+            background-color: #121212;
+            color: white;
+            font-family: Arial, sans-serif;
+        }
+        .stButton > button {
+            background-color: red;
+            color: white;
+            border-radius: 8px;
+            padding: 10px 20px;
+            font-size: 18px;
+        }
+        .stNumberInput > label {
+            font-size: 16px;
+            font-weight: bold;
+        }
+    </style>
+    """
+
+
+def apply_dark_theme():
+    st.markdown(DARK_THEME_CSS, unsafe_allow_html=True)
@@ -0,0 +1,285 @@
+"""Point-mass vehicle model: the lap of the trapezoid model, with forces instead of fixed accelerations.
+
+    python f1_vehicle_model.py check --setups 10000   # limiting case vs lap_phases
+    python f1_vehicle_model.py lap --track-length 5000 --max-speed 300
+
+The car starts from standstill, accelerates as hard as power and traction
+allow against aerodynamic drag, cruises at ``max_speed_kmh`` if it gets there,
+and brakes to a stop at the end of the track:
+
+    drive:   a(v) = min(P / (m v), k μ (g + D v² / m)) - C v² / m
+    brake:   b(v) = μ (g + D v² / m) + C v² / m
+
+where C = ½ρ·CdA and D = ½ρ·ClA. The drive phase has no closed form, because
+the power and grip limits cross over. Speed and distance are therefore
+time-stepped with adaptive Dormand-Prince 5(4) steps, each setup with its own
+step size. The braking distance and time do have closed forms. Integration
+stops at the first of two events: reaching the target speed, or reaching the
+point where the car must start braking. Every setup argument broadcasts, and
+all setups are stepped together.
+"""
+import argparse
+
+import numpy as np
+
+from f1_lap_model import KMH_TO_MS, lap_phases
+
+# --- Car Defaults (roughly a current F1 car) ---
+GRAVITY = 9.81  # m/s²
+AIR_DENSITY = 1.225  # kg/m³
+DEFAULT_MASS = 798.0  # kg, with driver
+DEFAULT_POWER = 750_000.0  # W
+DEFAULT_DRAG_AREA = 1.0  # CdA, m²
+DEFAULT_DOWNFORCE_AREA = 3.0  # ClA, m²
+DEFAULT_GRIP = 1.6  # tyre friction coefficient
+DEFAULT_DRIVE_FRACTION = 0.6  # share of the grip the driven wheels can use for traction
+
+RTOL = 1e-8  # per-step error tolerance on speed and distance, relative
+MAX_STEPS = 10_000
+STALL_ACCELERATION = 1e-6  # m/s²; below this the car has stopped gaining speed
+
+
+def _acceleration(v, mass, power, drag, downforce, grip, drive_fraction):
+    """a(v) while accelerating: the lower of the power and traction limits, less drag."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # At standstill any power gives unbounded force (traction is the limit), no power gives none
+        power_limit = np.where(v > 0, power / (mass * np.maximum(v, 0.0)), np.where(power > 0, np.inf, 0.0))
+    traction = drive_fraction * grip * (GRAVITY + downforce * v**2 / mass)
+    return np.minimum(power_limit, traction) - drag * v**2 / mass
+
+
+def _braking(v, mass, drag, downforce, grip):
+    """Distance and time to brake from ``v`` to a stop with b(v) = β + γ·v² (exact)."""
+    beta = grip * GRAVITY
+    gamma = (grip * downforce + drag) / mass
+    x = gamma * v**2 / beta
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # log1p(x)/x and atan(√x)/√x -> 1 as x -> 0, which is the constant-deceleration case
+        distance_factor = np.where(x > 1e-12, np.log1p(x) / x, 1.0)
+        time_factor = np.where(x > 1e-12, np.arctan(np.sqrt(x)) / np.sqrt(x), 1.0)
+    return v**2 / (2 * beta) * distance_factor, v / beta * time_factor
+
+
+# Dormand-Prince 5(4) tableau: stage weights, 5th-order solution, embedded error
+DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+DP_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0])
+DP_E = DP_B - np.array([5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40])
+EVENT_ITERATIONS = 50  # bisection halvings of the step fraction, down to ~1e-15
+
+
+def _hermite(theta, h, v0, v1, a0, a1):
+    """Speed and distance covered at ``theta`` of a step, from the cubic Hermite speed curve."""
+    t2, t3, t4 = theta**2, theta**3, theta**4
+    v = (2 * t3 - 3 * t2 + 1) * v0 + (t3 - 2 * t2 + theta) * h * a0 + (3 * t2 - 2 * t3) * v1 + (t3 - t2) * h * a1
+    s = h * ((t4 / 2 - t3 + theta) * v0 + (t4 / 4 - 2 * t3 / 3 + t2 / 2) * h * a0 + (t3 - t4 / 2) * v1
+             + (t4 / 4 - t3 / 3) * h * a1)
+    return v, s
+
+
+def simulate_laps(track_length, max_speed_kmh=np.inf, mass=DEFAULT_MASS, power=DEFAULT_POWER,
+                  drag_area=DEFAULT_DRAG_AREA, downforce_area=DEFAULT_DOWNFORCE_AREA, grip=DEFAULT_GRIP,
+                  drive_fraction=DEFAULT_DRIVE_FRACTION, rtol=RTOL, record=False):
+    """Lap times of one or many car setups on a straight of ``track_length`` metres.
+
+    Arguments may be scalars or NumPy arrays and are broadcast against each
+    other. Returns a dict of arrays shaped like the broadcast setups:
+    ``lap_time``, ``t_accel``/``s_accel`` (drive phase), ``v_peak`` (m/s),
+    ``t_constant``/``s_constant`` (cruise, 0 when the car must brake before
+    reaching ``max_speed_kmh``), ``t_braking``/``s_braking`` and ``steps``
+    (integration steps taken) and ``valid``. A setup is invalid when the car
+    can't move off the line, or stops gaining speed or runs out of steps
+    before it reaches ``max_speed_kmh`` or the braking point; its
+    ``lap_time`` is NaN. With ``record=True`` it also returns the
+    accepted drive-phase points as ``trace`` = (t, s, v) arrays of shape
+    (steps + 1, setups), NaN-padded. That is meant for plotting a few setups.
+    """
+    setups = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (
+        track_length, max_speed_kmh, mass, power, drag_area, downforce_area, grip, drive_fraction)))
+    shape = setups[0].shape
+    length, v_max, mass, power, drag_area, downforce_area, grip, drive_fraction = (x.ravel() for x in setups)
+    v_max = v_max * KMH_TO_MS
+    drag, downforce = 0.5 * AIR_DENSITY * drag_area, 0.5 * AIR_DENSITY * downforce_area
+    n = length.size
+
+    # Drive-phase state of every setup (time, distance, speed); finished setups leave the active set
+    t, s, v = np.zeros(n), np.zeros(n), np.zeros(n)
+    steps = np.zeros(n, dtype=np.int64)
+    reached = np.zeros(n, dtype=bool)  # drive phase ended at the target speed or the braking point
+    a = _acceleration(v, mass, power, drag, downforce, grip, drive_fraction)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = np.where(a > 0, np.minimum(np.minimum(v_max, 100.0) / a, 10.0) / 100, 0.0)  # s
+    active = np.flatnonzero((length > 0) & (v_max > 0) & (a > STALL_ACCELERATION))
+    trace = [(t.copy(), s.copy(), v.copy())] if record else None
+
+    while active.size:
+        i = active
+        car = (mass[i], power[i], drag[i], downforce[i], grip[i], drive_fraction[i])
+        hi, v0, a0 = h[i], v[i], a[i]
+
+        # One Dormand-Prince step of dv/dt = a(v), ds/dt = v
+        stage_v, stage_a = [v0], [a0]
+        for row in DP_A[1:]:
+            stage_v.append(v0 + hi * sum(weight * k for weight, k in zip(row, stage_a) if weight))
+            stage_a.append(_acceleration(stage_v[-1], *car))
+        v1 = stage_v[-1]  # the last row of the tableau is the 5th-order solution (FSAL)
+        s1 = s[i] + hi * sum(weight * k for weight, k in zip(DP_B, stage_v) if weight)
+        error_v = hi * sum(weight * k for weight, k in zip(DP_E, stage_a) if weight)
+        error_s = hi * sum(weight * k for weight, k in zip(DP_E, stage_v) if weight)
+        error = np.maximum(np.abs(error_v) / (rtol * np.maximum(np.abs(v1), 1.0)),
+                           np.abs(error_s) / (rtol * np.maximum(np.abs(s1), 1.0)))
+        accepted = error <= 1.0
+        with np.errstate(divide="ignore"):
+            h[i] = hi * np.clip(0.9 * error ** -0.2, 0.2, 5.0)
+
+        i, hi, v0, a0, v1, s1 = (x[accepted] for x in (i, hi, v0, a0, v1, s1))
+        a1 = stage_a[-1][accepted]
+        s0, braking_args = s[i], (mass[i], drag[i], downforce[i], grip[i])
+        steps[i] += 1
+
+        # Events: reaching the target speed, or the point where braking must start. Both only
+        # grow along the step, so the first one is found by bisection on the dense output
+        hit = (v1 >= v_max[i]) | (s1 + _braking(v1, *braking_args)[0] >= length[i])
+        stalled = a1 < STALL_ACCELERATION  # no further progress: the lap can't be finished as modelled
+        theta = np.ones(len(i))
+        if hit.any():
+            step = (hi[hit], v0[hit], v1[hit], a0[hit], a1[hit])
+            target, start, end = v_max[i][hit], s0[hit], length[i][hit]
+            step_braking = tuple(x[hit] for x in braking_args)
+            low, high = np.zeros(hit.sum()), np.ones(hit.sum())
+            for _ in range(EVENT_ITERATIONS):
+                middle = (low + high) / 2
+                v_mid, ds_mid = _hermite(middle, *step)
+                over = (v_mid >= target) | (start + ds_mid + _braking(v_mid, *step_braking)[0] >= end)
+                high = np.where(over, middle, high)
+                low = np.where(over, low, middle)
+            theta[hit] = high
+
+        v_end, ds_end = _hermite(theta, hi, v0, v1, a0, a1)
+        v_end = np.where(hit, np.minimum(v_end, v_max[i]), v1)
+        t[i] += theta * hi
+        s[i] = np.where(hit, s0 + ds_end, s1)
+        v[i] = v_end
+        a[i] = _acceleration(v_end, *(x[i] for x in (mass, power, drag, downforce, grip, drive_fraction)))
+        reached[i[hit]] = True
+        done = hit | stalled | (steps[i] >= MAX_STEPS)
+        if record:
+            point = np.full((3, n), np.nan)
+            point[:, i] = t[i], s[i], v[i]
+            trace.append(tuple(point))
+        active = np.setdiff1d(active, i[done], assume_unique=True)
+
+    v_peak = v
+    s_braking, t_braking = _braking(v_peak, mass, drag, downforce, grip)
+    s_constant = np.maximum(length - s - s_braking, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_constant = np.where(s_constant > 0, s_constant / v_peak, 0.0)
+    valid = reached
+    lap_time = np.where(valid, t + t_constant + t_braking, np.nan)
+
+    result = {
+        "lap_time": lap_time,
+        "t_accel": t,
+        "s_accel": s,
+        "v_peak": v_peak,
+        "t_constant": t_constant,
+        "s_constant": s_constant,
+        "t_braking": t_braking,
+        "s_braking": s_braking,
+        "steps": steps,
+        "valid": valid,
+    }
+    # Shaped like the broadcast inputs; 0-d results come back as NumPy scalars, like lap_phases
+    result = {key: value.reshape(shape)[()] for key, value in result.items()}
+    if record:
+        result["trace"] = tuple(np.array([point[k] for point in trace]) for k in range(3))
+    return result
+
+
+# --- Speed Trace ---
+def lap_trace(track_length, max_speed_kmh=np.inf, mass=DEFAULT_MASS, power=DEFAULT_POWER,
+              drag_area=DEFAULT_DRAG_AREA, downforce_area=DEFAULT_DOWNFORCE_AREA, grip=DEFAULT_GRIP,
+              drive_fraction=DEFAULT_DRIVE_FRACTION, braking_points=50):
+    """One setup's lap as ``time``, ``distance`` and ``speed`` (m/s) arrays for plotting, with the result dict."""
+    result = simulate_laps(track_length, max_speed_kmh, mass, power, drag_area, downforce_area, grip,
+                           drive_fraction, record=True)
+    t, s, v = (x[:, 0] for x in result.pop("trace"))
+    keep = ~np.isnan(t)
+    t, s, v = t[keep], s[keep], v[keep]
+    if result["t_constant"] > 0:
+        t = np.append(t, t[-1] + result["t_constant"])
+        s = np.append(s, s[-1] + result["s_constant"])
+        v = np.append(v, v[-1])
+
+    # Braking from the peak: the time to stop from each intermediate speed gives its position in time and distance
+    v_brake = np.linspace(float(result["v_peak"]), 0.0, braking_points)[1:]
+    s_left, t_left = _braking(v_brake, mass, 0.5 * AIR_DENSITY * drag_area, 0.5 * AIR_DENSITY * downforce_area, grip)
+    time = np.concatenate([t, t[-1] + result["t_braking"] - t_left])
+    distance = np.concatenate([s, s[-1] + result["s_braking"] - s_left])
+    return {"time": time, "distance": distance, "speed": np.concatenate([v, v_brake]), **result}
+
+
+# --- Limiting Case ---
+def trapezoid_setup(acceleration, braking):
+    """Car parameters for which the model reduces to lap_phases' constant acceleration and braking:
+    no aerodynamics, unlimited power, grip giving ``braking`` and a drive share giving ``acceleration``."""
+    grip = np.asarray(braking, dtype=float) / GRAVITY
+    return {"power": np.inf, "drag_area": 0.0, "downforce_area": 0.0, "grip": grip,
+            "drive_fraction": np.asarray(acceleration, dtype=float) / np.asarray(braking, dtype=float)}
+
+
+def check_against_trapezoid(n_setups=10_000, seed=0):
+    """Largest relative lap-time difference to lap_phases over random valid setups in the limiting case."""
+    rng = np.random.default_rng(seed)
+    track_length = rng.uniform(3000, 7000, n_setups)
+    avg_speed_kmh = rng.uniform(150, 350, n_setups)
+    acceleration = rng.uniform(2, 6, n_setups)
+    braking = rng.uniform(4, 8, n_setups)
+    expected = lap_phases(track_length, avg_speed_kmh, acceleration, braking)
+    valid = expected["valid"]
+    model = simulate_laps(track_length[valid], avg_speed_kmh[valid],
+                          **{key: value[valid] if np.ndim(value) else value
+                             for key, value in trapezoid_setup(acceleration, braking).items()})
+    return float(np.max(np.abs(model["lap_time"] / expected["lap_time"][valid] - 1))), int(valid.sum())
+
+
+def main(argv=None):
+    import time
+
+    parser = argparse.ArgumentParser(description="Point-mass vehicle lap model.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    check = commands.add_parser("check", help="compare the limiting case with the trapezoid model")
+    check.add_argument("--setups", type=int, default=10_000)
+    lap = commands.add_parser("lap", help="lap time of one setup")
+    lap.add_argument("--track-length", type=float, default=5000.0)
+    lap.add_argument("--max-speed", type=float, default=np.inf, help="km/h")
+    lap.add_argument("--mass", type=float, default=DEFAULT_MASS)
+    lap.add_argument("--power", type=float, default=DEFAULT_POWER, help="W")
+    lap.add_argument("--drag-area", type=float, default=DEFAULT_DRAG_AREA)
+    lap.add_argument("--downforce-area", type=float, default=DEFAULT_DOWNFORCE_AREA)
+    lap.add_argument("--grip", type=float, default=DEFAULT_GRIP)
+    args = parser.parse_args(argv)
+
+    if args.command == "check":
+        start = time.perf_counter()
+        worst, checked = check_against_trapezoid(args.setups)
+        elapsed = time.perf_counter() - start
+        print(f"{checked} valid setups, max relative difference {worst:.2e} "
+              f"({elapsed * 1e6 / max(checked, 1):.1f} us per setup)")
+    else:
+        result = simulate_laps(args.track_length, args.max_speed, args.mass, args.power, args.drag_area,
+                               args.downforce_area, args.grip)
+        print(f"lap {result['lap_time']:.2f} s: accelerate {result['t_accel']:.2f} s / {result['s_accel']:.0f} m "
+              f"to {result['v_peak'] / KMH_TO_MS:.0f} km/h, cruise {result['t_constant']:.2f} s, "
+              f"brake {result['t_braking']:.2f} s / {result['s_braking']:.0f} m ({result['steps']} steps)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import csv
+import io
+import json
+
+import pytest
+
+from f1_lap_time_batch import RESULT_FIELDS, read_scenarios, run_batch
+
+
+def _run(text, in_format, out_format, chunk_size=2):
+    out = io.StringIO()
+    run_batch(read_scenarios(io.StringIO(text), in_format), out, out_format, chunk_size=chunk_size)
+    return out.getvalue()
+
+
+def test_jsonl_to_csv_with_optional_keys_appearing_later():
+    lines = [
+        {"track_length": 5000, "avg_speed_kmh": 250},
+        {"track_length": 5000, "avg_speed_kmh": 250, "braking": 7},
+        {"track_length": 4000, "avg_speed_kmh": 200, "acceleration": 5},
+    ]
+    text = _run("".join(json.dumps(line) + "\n" for line in lines), "jsonl", "csv")
+
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert tuple(rows[0]) == ("track_length", "avg_speed_kmh", "acceleration", "braking") + RESULT_FIELDS
+    assert [row["braking"] for row in rows] == ["", "7", ""]
+    assert [row["acceleration"] for row in rows] == ["", "", "5"]
+    assert all(row["lap_time"] for row in rows)
+
+
+def test_csv_keeps_extra_input_columns():
+    text = _run("id,track_length,avg_speed_kmh\nmonza-1,5793,250\nspa-2,7004,230\nsuzuka-3,5807,220\n", "csv", "csv")
+
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert list(rows[0])[:5] == ["id", "track_length", "avg_speed_kmh", "acceleration", "braking"]
+    assert [row["id"] for row in rows] == ["monza-1", "spa-2", "suzuka-3"]
+    assert all(row["lap_time"] for row in rows)
+
+
+def test_malformed_row_reports_its_number():
+    text = "track_length,avg_speed_kmh\n5000,250\n5000,250\nabc,250\n"
+    with pytest.raises(ValueError, match="scenario 3: 'track_length'"):
+        _run(text, "csv", "csv")